@@ -7,6 +7,7 @@ PATH_HOME = os.path.join(str(Path.home()), 'migration')
 PATH_TEMPLATE = '/usr/local/share/applications/migration_factory'
 PATH_CONFIG = '/etc/migration_factory'
 PATH_DEFAULT_POST_LAUNCH = os.path.join(PATH_HOME, DIRECTORY_POST_LAUNCH)
+PATH_CACHE = os.path.join(PATH_HOME, '.cache')
 
 ENV_VAR_AWS_ACCESS_KEY_NAMES = ['MF_AWS_ACCESS_KEY_ID', 'AWS_ACCESS_KEY_ID', 'AWS_ACCESS_KEY']
 ENV_VAR_AWS_SECRET_KEY_NAMES = ['MF_AWS_SECRET_ACCESS_KEY', 'AWS_SECRET_ACCESS_KEY', 'AWS_SECRET_KEY']
@@ -16,9 +17,13 @@ ENV_VAR_DEFAULTS_CONFIG_FILE = ['MF_DEFAULTS_CONFIG_FILE']
 ENV_VAR_CONFIG_FILE = ['MF_CONFIG_FILE']
 ENV_VAR_MIGRATION_FACTORY_USERNAME = ['MF_USERNAME', 'MF_FACTORY_USERNAME', 'MF_MIGRATION_FACTORY_USERNAME']
 ENV_VAR_MIGRATION_FACTORY_PASSWORD = ['MF_PASSWORD', 'MF_FACTORY_PASSWORD', 'MF_MIGRATION_FACTORY_PASSWORD']
+ENV_VAR_CLOUDENDURE_HOST = ['MF_CLOUDENDURE_HOST', 'MF_CE_HOST']
 ENV_VAR_CLOUDENDURE_TOKEN = [
     'MF_CE_API_TOKEN', 'MF_CE_TOKEN', 'MF_CLOUDENDURE_TOKEN', 'MF_CLOUDENDURE_API_TOKEN', 'CE_API_TOKEN'
 ]
+ENV_VAR_PERSISTENT_CACHE = ['MF_PERSISTENT_CACHE', 'MF_CACHE_PERSISTENT']
+ENV_VAR_TRACE_FILE = ['MF_TRACE_FILE']
+ENV_VAR_TRACE_SUMMARY = ['MF_TRACE_SUMMARY']
 ENV_VAR_WINDOWS_USERNAME = ['MF_WINDOWS_USERNAME',
                             'MF_FACTORY_WINDOWS_USERNAME', 'MF_MIGRATION_FACTORY_WINDOWS_USERNAME']
 ENV_VAR_WINDOWS_PASSWORD = ['MF_WINDOWS_PASSWORD',
@@ -38,11 +43,16 @@ ENV_VAR_LINUX_PRIVATE_KEY_FILE = ['MF_LINUX_PRIVATE_KEY_FILE', 'MF_LINUX_KEY_FIL
 FILE_CSV_WAVE_TEMPLATE = 'migration-intake-form.csv'
 FILE_CSV_TAG = 'migration-tags.csv'
 FILE_MARKER_PREPARE_DONE = '.mf_prepare_done'
+FILE_HTTP_CACHE = 'http_cache.sqlite'
+FILE_MIGRATION_FACTORY_TOKENS = 'mf_tokens.json'
+FILE_CLOUDENDURE_SESSIONS = 'ce_sessions.json'
+FILE_REPLICATION_TELEMETRY = 'replication_{}.json'
 
 
 DEFAULT_ENV_VAR_ENDPOINT_CONFIG_FILE = os.path.join(PATH_CONFIG, 'endpoints.yml')
 DEFAULT_ENV_VAR_DEFAULTS_CONFIG_FILE = os.path.join(PATH_CONFIG, 'defaults.yml')
 DEFAULT_ENV_VAR_CONFIG_FILE = os.path.join(PATH_CONFIG, 'config.yml')
+DEFAULT_CLOUDENDURE_HOST = 'https://console.cloudendure.com'
 
 BRAND = 'Migration Factory'
 
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+
+import asyncio
+import functools
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List
+
+from .cloud_endure import CloudEndureRequester
+from .config_loaders import EndpointsLoader
+from .migration_factory import MigrationFactoryRequester
+from .utils import HttpSessionPool, Requester
+
+
+class AsyncRequesterBase:
+    """
+        Runs the methods of a requester as coroutines.
+        Calls run on a bounded thread pool sharing the keep-alive sessions of HttpSessionPool,
+        so that hundreds of requests can be fanned out from a single event loop.
+        Listings are async generators: their items are pulled by batches on the thread pool, never on the loop.
+        Subclasses declare the coroutines of one requester, with the signatures of its methods.
+    """
+
+    DEFAULT_CONCURRENCY = 16
+    ITERATION_BATCH_SIZE = 100
+
+    _requester = None
+    _concurrency: int = DEFAULT_CONCURRENCY
+    _executor: ThreadPoolExecutor = None
+    _semaphore: asyncio.Semaphore = None
+
+    def __init__(self, requester, concurrency: int = DEFAULT_CONCURRENCY):
+        self._requester = requester
+        self._concurrency = max(1, concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._concurrency, thread_name_prefix=self.__class__.__name__
+        )
+        HttpSessionPool.ensure_pool_size(self._concurrency)
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._requester, name)
+        if not callable(attribute):
+            return attribute
+
+        # Methods without an explicit counterpart: lazy results are consumed on the thread pool too
+        @functools.wraps(attribute)
+        async def call(*args, **kwargs):
+            return await self.run(self._consume, attribute, *args, **kwargs)
+
+        return call
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_requester(self):
+        return self._requester
+
+    async def run(self, function: Callable, *args, **kwargs):
+        async with self._get_semaphore():
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(function, *args, **kwargs)
+            )
+
+    async def iterate(self, function: Callable, *args, **kwargs) -> AsyncIterator[Any]:
+        iterator = iter(await self.run(function, *args, **kwargs))
+
+        while True:
+            batch = await self.run(list, itertools.islice(iterator, self.ITERATION_BATCH_SIZE))
+            if not batch:
+                return
+
+            for item in batch:
+                yield item
+
+    async def map(self, method_name: str, arguments: Iterable[Any]) -> List[Any]:
+        method = getattr(self, method_name)
+
+        return await self.gather(*[method(argument) for argument in arguments])
+
+    @classmethod
+    async def gather(cls, *calls: Awaitable) -> List[Any]:
+        return list(await asyncio.gather(*calls))
+
+    def close(self):
+        logging.getLogger('root').debug('{}: shutting down {} workers'.format(
+            self.__class__.__name__, self._concurrency
+        ))
+        self._executor.shutdown(wait=True)
+
+    @classmethod
+    def _consume(cls, function: Callable, *args, **kwargs):
+        result = function(*args, **kwargs)
+
+        return list(result) if isinstance(result, Iterator) else result
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily: before Python 3.10, a semaphore is bound to the event loop running at its creation
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+
+        return self._semaphore
+
+
+class AsyncRequester(AsyncRequesterBase):
+    """ Awaitable counterpart of Requester """
+
+    def __init__(self, requester=Requester, concurrency: int = AsyncRequesterBase.DEFAULT_CONCURRENCY):
+        super().__init__(requester, concurrency)
+
+    async def get(self, uri, url=None, headers=None, data=None, request_instance=None, exit_on_error=True,
+                  response_type=Requester.RESPONSE_TYPE_JSON):
+        return await self.run(
+            self._requester.get, uri, url=url, headers=headers, data=data, request_instance=request_instance,
+            exit_on_error=exit_on_error, response_type=response_type
+        )
+
+    async def get_stream(self, uri, url=None, headers=None, request_instance=None, exit_on_error=True,
+                         fields=None) -> AsyncIterator[Any]:
+        async for item in self.iterate(
+                self._requester.get_stream, uri, url=url, headers=headers, request_instance=request_instance,
+                exit_on_error=exit_on_error, fields=fields
+        ):
+            yield item
+
+    async def post(self, uri, url=None, headers=None, data=None, request_instance=None, exit_on_error=True,
+                   response_type=Requester.RESPONSE_TYPE_JSON):
+        return await self.run(
+            self._requester.post, uri, url=url, headers=headers, data=data, request_instance=request_instance,
+            exit_on_error=exit_on_error, response_type=response_type
+        )
+
+    async def put(self, uri, url=None, headers=None, data=None, request_instance=None, exit_on_error=True,
+                  response_type=Requester.RESPONSE_TYPE_JSON):
+        return await self.run(
+            self._requester.put, uri, url=url, headers=headers, data=data, request_instance=request_instance,
+            exit_on_error=exit_on_error, response_type=response_type
+        )
+
+    async def patch(self, uri, url=None, headers=None, data=None, request_instance=None, exit_on_error=True,
+                    response_type=Requester.RESPONSE_TYPE_JSON):
+        return await self.run(
+            self._requester.patch, uri, url=url, headers=headers, data=data, request_instance=request_instance,
+            exit_on_error=exit_on_error, response_type=response_type
+        )
+
+    async def delete(self, uri, url=None, headers=None, data=None, request_instance=None, exit_on_error=True,
+                     response_type=Requester.RESPONSE_TYPE_JSON):
+        return await self.run(
+            self._requester.delete, uri, url=url, headers=headers, data=data, request_instance=request_instance,
+            exit_on_error=exit_on_error, response_type=response_type
+        )
+
+
+class AsyncMigrationFactoryRequester(AsyncRequesterBase):
+    """ Awaitable counterpart of MigrationFactoryRequester """
+
+    def __init__(self, endpoints_loader: EndpointsLoader,
+                 concurrency: int = AsyncRequesterBase.DEFAULT_CONCURRENCY):
+        super().__init__(MigrationFactoryRequester(endpoints_loader), concurrency)
+
+    async def iter_user_list(self, resource: str, fields: List[str] = None,
+                             refresh: bool = False) -> AsyncIterator[dict]:
+        async for record in self.iterate(self._requester.iter_user_list, resource, fields=fields, refresh=refresh):
+            yield record
+
+    async def get(self, uri, url=None, headers=None, response_type=Requester.RESPONSE_TYPE_JSON):
+        return await self.run(self._requester.get, uri, url=url, headers=headers, response_type=response_type)
+
+    async def put(self, uri, url=None, headers=None, data=None, response_type=Requester.RESPONSE_TYPE_JSON,
+                  exit_on_error=True):
+        return await self.run(
+            self._requester.put, uri, url=url, headers=headers, data=data, response_type=response_type,
+            exit_on_error=exit_on_error
+        )
+
+    async def post(self, uri, url=None, headers=None, data=None, response_type=Requester.RESPONSE_TYPE_JSON,
+                   exit_on_error=True):
+        return await self.run(
+            self._requester.post, uri, url=url, headers=headers, data=data, response_type=response_type,
+            exit_on_error=exit_on_error
+        )
+
+    async def delete(self, uri, url=None, headers=None, response_type=Requester.RESPONSE_TYPE_JSON,
+                     exit_on_error=True):
+        return await self.run(
+            self._requester.delete, uri, url=url, headers=headers, response_type=response_type,
+            exit_on_error=exit_on_error
+        )
+
+    async def get_user_wave_by_name(self, wave_name: str):
+        return await self.run(self._requester.get_user_wave_by_name, wave_name)
+
+    async def get_user_server_by_name(self, server_name: str):
+        return await self.run(self._requester.get_user_server_by_name, server_name)
+
+    async def get_user_servers_by_wave_name(self, wave_name: str):
+        return await self.run(self._requester.get_user_servers_by_wave_name, wave_name)
+
+
+class AsyncCloudEndureRequester(AsyncRequesterBase):
+    """ Awaitable counterpart of CloudEndureRequester """
+
+    def __init__(self, concurrency: int = AsyncRequesterBase.DEFAULT_CONCURRENCY):
+        super().__init__(CloudEndureRequester(), concurrency)
+
+    async def get(self, uri):
+        return await self.run(self._requester.get, uri)
+
+    async def post(self, uri, data=None):
+        return await self.run(self._requester.post, uri, data=data)
+
+    async def patch(self, uri, data=None):
+        return await self.run(self._requester.patch, uri, data=data)
+
+    async def delete(self, uri, data=None, exit_on_error=True):
+        return await self.run(self._requester.delete, uri, data=data, exit_on_error=exit_on_error)
+
+    async def iter_items(self, uri: str, page_size: int = CloudEndureRequester.DEFAULT_PAGE_SIZE,
+                         refresh: bool = False) -> AsyncIterator[dict]:
+        async for item in self.iterate(self._requester.iter_items, uri, page_size=page_size, refresh=refresh):
+            yield item
+
+    async def iter_machines(self, project_name: str, page_size: int = CloudEndureRequester.DEFAULT_PAGE_SIZE,
+                            refresh: bool = False) -> AsyncIterator[dict]:
+        async for machine in self.iterate(
+                self._requester.iter_machines, project_name, page_size=page_size, refresh=refresh
+        ):
+            yield machine
+
+    async def get_project_id(self, project_name: str):
+        return await self.run(self._requester.get_project_id, project_name)
+
+    async def get_machine_index(self, project_name: str, refresh: bool = False):
+        return await self.run(self._requester.get_machine_index, project_name, refresh=refresh)
+
+    async def get_machine_replicas(
+            self, project_name: str, replica_ids: List[str],
+            concurrency: int = CloudEndureRequester.DEFAULT_REPLICA_CONCURRENCY
+    ) -> Dict[str, dict]:
+        return await self.run(
+            self._requester.get_machine_replicas, project_name, replica_ids, concurrency=concurrency
+        )
+
+
+if __name__ == '__main__':
+    print("This file is a library file. It cannot be called directly.")
@@ -2,8 +2,11 @@
 
 import logging
 import re
+import time
+from typing import Callable, Dict, List
 
 import boto3
+from botocore.config import Config
 
 from . import ENV_VAR_AWS_ACCESS_KEY_NAMES
 from . import ENV_VAR_AWS_REGION_NAMES
@@ -14,6 +17,9 @@ from .utils import EnvironmentVariableFetcher
 class AWSServiceAccessor:
     """ Allows access to AWS API endpoints """
 
+    # Shared by every client: throttled calls are retried with client-side rate limiting
+    BOTO_CONFIG = Config(retries={'max_attempts': 10, 'mode': 'adaptive'})
+
     _environment_variable_fetcher = None
     _aws_access_key = ''
     _aws_secret_access_key = ''
@@ -34,7 +40,8 @@ class AWSServiceAccessor:
                 'ec2',
                 aws_access_key_id=self._aws_access_key,
                 aws_secret_access_key=self._aws_secret_access_key,
-                region_name=self._aws_region
+                region_name=self._aws_region,
+                config=self.BOTO_CONFIG
             )
 
         return self._ec2_client
@@ -59,6 +66,77 @@ class AWSServiceAccessor:
         return instance_ip
 
 
+class EC2InstanceStatusChecker:
+    """
+        Checks the 2/2 status checks of many EC2 instances.
+        Instance ids are sent by chunks through the describe_instance_status paginator and results are indexed by id.
+    """
+
+    # describe_instance_status accepts at most 100 instance ids per request
+    MAX_INSTANCE_IDS = 100
+
+    STATUS_PASSED = 'passed'
+    STATUS_FAILED = 'failed'
+    STATUS_NOT_RUNNING = 'not running'
+
+    _ec2_client = None
+
+    def __init__(self, ec2_client):
+        self._ec2_client = ec2_client
+
+    def get_statuses(self, instance_ids: List[str]) -> Dict[str, str]:
+        statuses = {}
+        paginator = self._ec2_client.get_paginator('describe_instance_status')
+
+        for index in range(0, len(instance_ids), self.MAX_INSTANCE_IDS):
+            pages = paginator.paginate(
+                InstanceIds=instance_ids[index:index + self.MAX_INSTANCE_IDS], IncludeAllInstances=True
+            )
+            for page in pages:
+                for instance_status in page['InstanceStatuses']:
+                    statuses[instance_status['InstanceId']] = self.get_status(instance_status)
+
+        # Instances launched a moment ago may not be reported yet
+        return {instance_id: statuses.get(instance_id, self.STATUS_NOT_RUNNING) for instance_id in instance_ids}
+
+    def wait_until_passed(self, instance_ids: List[str], interval: float, timeout: float,
+                          on_round: Callable[[Dict[str, str]], None] = None) -> Dict[str, str]:
+        statuses = {}
+        pending_instance_ids = list(dict.fromkeys(instance_ids))
+        deadline = time.monotonic() + timeout
+
+        while pending_instance_ids:
+            # Instances that passed are not checked again
+            statuses.update(self.get_statuses(pending_instance_ids))
+            pending_instance_ids = [
+                instance_id for instance_id in pending_instance_ids if statuses[instance_id] != self.STATUS_PASSED
+            ]
+
+            if on_round is not None:
+                on_round(statuses)
+
+            if not pending_instance_ids or time.monotonic() + interval > deadline:
+                break
+
+            logging.getLogger('root').debug('{}: {} instance(s) pending, checking again in {} seconds'.format(
+                self.__class__.__name__, len(pending_instance_ids), interval
+            ))
+            time.sleep(interval)
+
+        return statuses
+
+    @classmethod
+    def get_status(cls, instance_status: dict) -> str:
+        if instance_status['InstanceState']['Name'] != 'running':
+            return cls.STATUS_NOT_RUNNING
+
+        if instance_status['InstanceStatus']['Status'].lower() == 'ok' and \
+                instance_status['SystemStatus']['Status'].lower() == 'ok':
+            return cls.STATUS_PASSED
+
+        return cls.STATUS_FAILED
+
+
 class AWSValidator:
     """ Check values to be compliant with AWS """
 
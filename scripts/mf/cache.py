@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import os
+from typing import List
+
+import requests
+import requests_cache
+
+from . import ENV_VAR_PERSISTENT_CACHE, FILE_HTTP_CACHE, PATH_CACHE
+from .utils import EnvironmentVariableFetcher
+
+
+class ResponseCache:
+    """
+        Installs the cache shared by all Migration Factory and CloudEndure responses.
+        The cache lives in memory by default. Once made persistent, it is kept on disk so that
+        successive commands reuse the responses fetched by the previous ones.
+    """
+
+    CACHE_NAME = 'migration_factory'
+    TRUTHY_VALUES = ['1', 'true', 'yes', 'y', 'on']
+
+    DEFAULT_EXPIRE_AFTER = 30
+
+    # Lifetime of the responses, in seconds, by URL glob pattern. First matching pattern wins.
+    URLS_EXPIRE_AFTER = {
+        '*/prod/user/servers': 60,
+        '*/prod/user/apps': 300,
+        '*/prod/user/waves': 300,
+        '*/api/*/projects/*/machines': 30,
+        '*/api/*/projects/*/replicas': 60,
+        '*/api/*/projects/*/replicationConfigurations': 300,
+        '*/api/*/projects': 300,
+        '*/api/*/cloudCredentials': 3600,
+        '*/api/*/clouds': 3600,
+        '*/api/*/licenses': 3600,
+    }
+
+    # Responses are only served to requests sent with the same credentials
+    MATCH_HEADERS = ['Authorization', 'X-XSRF-TOKEN']
+
+    _is_set_up = False
+
+    @classmethod
+    def add_arguments(cls, parser: argparse.ArgumentParser):
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Do not cache any API response. Lists are then streamed instead of being downloaded whole'
+        )
+        parser.add_argument(
+            '--refresh', action='store_true', help='Discard the cached API responses before running'
+        )
+        parser.add_argument(
+            '--persistent-cache',
+            action='store_true',
+            help='Keep API responses on disk to be reused by next commands. Defaults to env var {}.'.format(
+                ENV_VAR_PERSISTENT_CACHE[0]
+            )
+        )
+
+    @classmethod
+    def setup(cls, arguments: argparse.Namespace = None):
+        cls.install(
+            persistent=getattr(arguments, 'persistent_cache', False),
+            refresh=getattr(arguments, 'refresh', False),
+            no_cache=getattr(arguments, 'no_cache', False),
+        )
+
+    @classmethod
+    def install(cls, persistent: bool = False, refresh: bool = False, no_cache: bool = False):
+        if cls._is_set_up:
+            return
+
+        cls._is_set_up = True
+
+        if no_cache:
+            logging.getLogger('root').info('{}: API responses will not be cached'.format(cls.__name__))
+            return
+
+        if persistent or cls._is_persistent_by_default():
+            requests_cache.install_cache(
+                cls._prepare_cache_file(),
+                backend='sqlite',
+                expire_after=cls.DEFAULT_EXPIRE_AFTER,
+                urls_expire_after=cls.URLS_EXPIRE_AFTER,
+                match_headers=cls.MATCH_HEADERS,
+            )
+        else:
+            requests_cache.install_cache(
+                cls.CACHE_NAME,
+                backend='memory',
+                expire_after=cls.DEFAULT_EXPIRE_AFTER,
+                urls_expire_after=cls.URLS_EXPIRE_AFTER,
+                match_headers=cls.MATCH_HEADERS,
+            )
+
+        if refresh:
+            logging.getLogger('root').info('{}: discarding cached API responses'.format(cls.__name__))
+            requests_cache.clear()
+
+    @classmethod
+    def evict(cls, urls: List[str], session: requests.Session, headers: dict = None):
+        cache = requests_cache.get_cache()
+        if cache is None:
+            return
+
+        for url in urls:
+            # Cache keys include the credential headers, sent per request or by the session (CloudEndure),
+            # and the resolved TLS verification setting, which CA bundle env vars change
+            verify = session.merge_environment_settings(url, {}, None, None, None)['verify']
+            request = session.prepare_request(requests.Request('GET', url, headers=headers))
+            cache.delete(cache.create_key(request, verify=verify))
+
+    @classmethod
+    def _is_persistent_by_default(cls):
+        return EnvironmentVariableFetcher.fetch(
+            env_var_names=ENV_VAR_PERSISTENT_CACHE, default=''
+        ).strip().lower() in cls.TRUTHY_VALUES
+
+    @classmethod
+    def _prepare_cache_file(cls):
+        # Responses contain authenticated data: cache must be readable by the current user only
+        os.makedirs(PATH_CACHE, mode=0o700, exist_ok=True)
+        cache_file = os.path.join(PATH_CACHE, FILE_HTTP_CACHE)
+        os.close(os.open(cache_file, os.O_CREAT | os.O_WRONLY, 0o600))
+        os.chmod(cache_file, 0o600)
+
+        logging.getLogger('root').debug('{}: using persistent cache “{}”'.format(cls.__name__, cache_file))
+
+        return cache_file
+
+
+if __name__ == '__main__':
+    print("This file is a library file. It cannot be called directly.")
@@ -1,53 +1,195 @@
 #!/usr/bin/env python3
 
+import hashlib
 import json
 import logging
+import os
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List
 
-import requests
+from . import DEFAULT_CLOUDENDURE_HOST, ENV_VAR_CLOUDENDURE_HOST, ENV_VAR_CLOUDENDURE_TOKEN
+from . import FILE_CLOUDENDURE_SESSIONS, PATH_CACHE
+from .cache import ResponseCache
+from .utils import EnvironmentVariableFetcher, HttpSessionPool, PrivateJsonFile
+from .utils import RequestError, Requester
 
-from . import ENV_VAR_CLOUDENDURE_TOKEN
-from .utils import EnvironmentVariableFetcher
-from .utils import Requester
+
+class CloudEndureSessionStore:
+    """
+        Persists CloudEndure session cookies, with their expiry, in a file readable by the user only.
+        Sessions are reused across script invocations instead of logging in again.
+    """
+
+    # CloudEndure session cookies have no expiry: the stored sessions are assumed to live this long
+    DEFAULT_SESSION_TTL = 1800
+    REFRESH_MARGIN = 60
+
+    _file: PrivateJsonFile = None
+
+    def __init__(self, path: str = None):
+        self._file = PrivateJsonFile(
+            path if path is not None else os.path.join(PATH_CACHE, FILE_CLOUDENDURE_SESSIONS)
+        )
+
+    def load(self, key: str):
+        stored_session = self._file.read().get(key)
+        if not stored_session or not self.is_fresh(stored_session.get('expires_at')):
+            return None
+
+        return stored_session
+
+    def save(self, key: str, cookies, api_endpoint_uri: str):
+        stored_sessions = self._file.read()
+        stored_sessions[key] = {
+            'cookies': [
+                {'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path}
+                for cookie in cookies
+            ],
+            'api_endpoint_uri': api_endpoint_uri,
+            'expires_at': self.get_expiry(cookies),
+        }
+        self._file.write(stored_sessions)
+
+    def discard(self, key: str):
+        stored_sessions = self._file.read()
+        if stored_sessions.pop(key, None) is not None:
+            self._file.write(stored_sessions)
+
+    @classmethod
+    def get_expiry(cls, cookies):
+        expiries = [cookie.expires for cookie in cookies if cookie.expires]
+
+        return min(expiries) if expiries else time.time() + cls.DEFAULT_SESSION_TTL
+
+    @classmethod
+    def is_fresh(cls, expires_at):
+        return expires_at is not None and time.time() + cls.REFRESH_MARGIN < expires_at
 
 
 class CloudEndureSession:
     """ Login to CloudEndure """
 
-    CLOUDENDURE_ENDPOINT_HOST = 'https://console.cloudendure.com'
+    CLOUDENDURE_ENDPOINT_HOST = DEFAULT_CLOUDENDURE_HOST
     CLOUDENDURE_ENDPOINT_URI = '/api/latest/{}'
 
+    LOGIN_ERRORS = {
+        401: 'The CloudEndure login credentials provided cannot be authenticated.',
+        402: 'There is no active license configured for this CloudEndure account.',
+        403: 'The CloudEndure login credentials provided cannot be authenticated.',
+        429: 'CloudEndure Authentication failure limit has been reached. '
+             'The service will become available for additional requests after a timeout.',
+    }
+
+    _shared_sessions: Dict[str, 'CloudEndureSession'] = {}
+    _shared_sessions_lock = threading.Lock()
+
     _api_token = None
+    _endpoint_host = None
     _api_endpoint_uri = None
     _session_token = None
     _session = None
+    _is_session_from_store = False
+    _session_store: CloudEndureSessionStore = None
+    _lock = None
 
     def __init__(self):
         self._api_token = EnvironmentVariableFetcher.fetch(
             env_var_names=ENV_VAR_CLOUDENDURE_TOKEN, env_var_description='CloudEndure API token'
         )
+        self._endpoint_host = EnvironmentVariableFetcher.fetch(
+            env_var_names=ENV_VAR_CLOUDENDURE_HOST, default=self.CLOUDENDURE_ENDPOINT_HOST
+        ).rstrip('/')
+        self._session_store = CloudEndureSessionStore()
+        self._lock = threading.Lock()
 
     def __call__(self):
         return self.get_session()
 
+    @classmethod
+    def get_shared(cls):
+        # Every requester of the process reuses the same login, API entry point and XSRF session
+        endpoint_host = EnvironmentVariableFetcher.fetch(
+            env_var_names=ENV_VAR_CLOUDENDURE_HOST, default=cls.CLOUDENDURE_ENDPOINT_HOST
+        ).rstrip('/')
+
+        with cls._shared_sessions_lock:
+            if endpoint_host not in cls._shared_sessions:
+                cls._shared_sessions[endpoint_host] = cls()
+
+            return cls._shared_sessions[endpoint_host]
+
     def login(self):
-        self._session = requests.Session()
-        self._session.headers.update({'Content-type': 'application/json', 'Accept': 'text/plain'})
+        self._create_session()
         self._api_endpoint_uri = self.CLOUDENDURE_ENDPOINT_URI
         response = self._login_request()
 
+        # CloudEndure redirects the login to the API entry point the account must use
+        if response.history:
+            self._api_endpoint_uri = '/' + '/'.join(response.url.split('/')[3:-1]) + '/{}'
+            logging.getLogger('root').debug('{}: using API entry point “{}”'.format(
+                self.__class__.__name__, self._api_endpoint_uri
+            ))
+            response = self._login_request()
+
         if response.status_code != 200:
-            logging.getLogger('root').error(self.__class__.__name__ + ': CloudEndure Login failed.')
+            logging.getLogger('root').error('{}: CloudEndure Login failed. {}'.format(
+                self.__class__.__name__, self.LOGIN_ERRORS.get(response.status_code, '')
+            ).rstrip())
             sys.exit(2)
 
-        self._session_token = self._session.cookies.get('XSRF-TOKEN')
-        self._session.headers['X-XSRF-TOKEN'] = self._session_token
+        self._set_session_token(self._session.cookies.get('XSRF-TOKEN'), is_from_store=False)
+        self._session_store.save(self._get_store_key(), self._session.cookies, self._api_endpoint_uri)
 
         return self._session
 
+    def discard_session(self, rejected_session=None):
+        # Concurrent requests rejected with the same session discard it once: only one of them logs in again
+        with self._lock:
+            was_from_store = self._is_session_from_store
+            if rejected_session is not None and rejected_session is not self._session:
+                return was_from_store
+
+            self._session_store.discard(self._get_store_key())
+            self._session_token = None
+            self._is_session_from_store = False
+
+        return was_from_store
+
+    def _restore_session(self):
+        stored_session = self._session_store.load(self._get_store_key())
+
+        if stored_session is None:
+            return False
+
+        logging.getLogger('root').debug('{}: reusing stored CloudEndure session'.format(self.__class__.__name__))
+        self._create_session()
+        for cookie in stored_session['cookies']:
+            self._session.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'])
+        self._api_endpoint_uri = stored_session['api_endpoint_uri']
+        self._set_session_token(self._session.cookies.get('XSRF-TOKEN'), is_from_store=True)
+
+        return self._session_token is not None
+
+    def _create_session(self):
+        self._session = HttpSessionPool.create_session()
+        self._session.headers.update({'Content-type': 'application/json', 'Accept': 'text/plain'})
+
+    def _set_session_token(self, session_token, is_from_store: bool):
+        self._session_token = session_token
+        self._session.headers['X-XSRF-TOKEN'] = session_token
+        self._is_session_from_store = is_from_store
+
+    def _get_store_key(self):
+        # The API token itself is never written: sessions are stored by its digest
+        return '{}@{}'.format(hashlib.sha256(self._api_token.encode()).hexdigest(), self._endpoint_host)
+
     def _login_request(self):
         response = self._session.post(
-            url=self.CLOUDENDURE_ENDPOINT_HOST + self._api_endpoint_uri.format('login'),
+            url=self._endpoint_host + self._api_endpoint_uri.format('login'),
             data=json.dumps({'userApiToken': self._api_token})
         )
         logging.getLogger('root').debug(self.__class__.__name__ + ':' + str(response))
@@ -55,23 +197,143 @@ class CloudEndureSession:
         return response
 
     def get_api_endpoint(self):
-        if self._api_endpoint_uri is None:
-            self.login()
+        self._ensure_logged_in()
 
-        return self.CLOUDENDURE_ENDPOINT_HOST + self._api_endpoint_uri
+        return self._endpoint_host + self._api_endpoint_uri
 
     def get_session_token(self):
-        if self._session_token is None:
-            self.login()
+        self._ensure_logged_in()
 
         return self._session_token
 
     def get_session(self):
-        if self._session is None:
-            self.login()
+        self._ensure_logged_in()
 
         return self._session
 
+    def _ensure_logged_in(self):
+        if self._session_token is not None:
+            return
+
+        # Concurrent callers must not log in twice: the second login would invalidate the first session
+        with self._lock:
+            if self._session_token is None and not self._restore_session():
+                self.login()
+
+
+class CloudEndureProjectIndex:
+    """
+        In-memory index of the CloudEndure projects by name and by id.
+        The projects list is fetched once, then every lookup is answered from the index until its TTL expires.
+        Writes on projects made through the requester invalidate it.
+    """
+
+    DEFAULT_TTL = 60
+
+    _requester = None
+    _ttl: float = DEFAULT_TTL
+    _projects: List[dict] = None
+    _by_name: Dict[str, dict] = {}
+    _by_id: Dict[str, dict] = {}
+    _expires_at: float = 0
+    _must_refresh: bool = False
+    _lock = None
+
+    def __init__(self, requester, ttl: float = DEFAULT_TTL):
+        self._requester = requester
+        self._ttl = ttl
+        self._projects = None
+        self._must_refresh = False
+        self._by_name = {}
+        self._by_id = {}
+        self._lock = threading.RLock()
+
+    def get_by_name(self, project_name: str):
+        with self._lock:
+            self._ensure_loaded()
+
+            return self._by_name.get(project_name)
+
+    def get_by_id(self, project_id: str):
+        with self._lock:
+            self._ensure_loaded()
+
+            return self._by_id.get(project_id)
+
+    def get_all(self) -> List[dict]:
+        with self._lock:
+            self._ensure_loaded()
+
+            return list(self._projects)
+
+    def invalidate(self):
+        logging.getLogger('root').debug('{}: invalidating the projects index'.format(self.__class__.__name__))
+
+        with self._lock:
+            self._projects = None
+            self._by_name = {}
+            self._by_id = {}
+            # The cached projects pages would otherwise rebuild the index with stale projects
+            self._must_refresh = True
+
+    def _ensure_loaded(self):
+        if self._projects is not None and time.monotonic() < self._expires_at:
+            return
+
+        self._by_name = {}
+        self._by_id = {}
+        projects = []
+        for project in self._requester.iter_projects(refresh=self._must_refresh):
+            # First occurrence wins, as the former linear scans did
+            self._by_name.setdefault(project['name'], project)
+            self._by_id.setdefault(project['id'], project)
+            projects.append(project)
+        self._projects = projects
+        self._expires_at = time.monotonic() + self._ttl
+        self._must_refresh = False
+
+        logging.getLogger('root').debug('{}: {} projects indexed'.format(self.__class__.__name__, len(projects)))
+
+
+class CloudEndureMachineIndex:
+    """
+        Index of the machines of a CloudEndure project, by lowercased source name and FQDN.
+        Built from a single machines list: refresh it once per polling round, not once per server.
+    """
+
+    _machines: List[dict] = []
+    _by_name: Dict[str, dict] = {}
+    _by_fqdn: Dict[str, dict] = {}
+
+    def __init__(self, machines: List[dict]):
+        self._machines = machines
+        self._by_name = {}
+        self._by_fqdn = {}
+
+        for machine in machines:
+            source_properties = machine.get('sourceProperties', {})
+            # First occurrence wins, as the former linear scans did
+            if source_properties.get('name'):
+                self._by_name.setdefault(source_properties['name'].lower(), machine)
+            if source_properties.get('fqdn'):
+                self._by_fqdn.setdefault(source_properties['fqdn'].lower(), machine)
+
+    def __len__(self):
+        return len(self._machines)
+
+    def get_machines(self) -> List[dict]:
+        return list(self._machines)
+
+    def get_by_name(self, machine_name: str):
+        return self._by_name.get(machine_name.lower())
+
+    def get_by_fqdn(self, fqdn: str):
+        return self._by_fqdn.get(fqdn.lower())
+
+    def find(self, name_or_fqdn: str):
+        # Agents may report the FQDN as source name
+        return self.get_by_name(name_or_fqdn) or self.get_by_fqdn(name_or_fqdn)
+
 
 class CloudEndureRequester:
     """ Allow to make requests against the CloudEndure* """
@@ -105,12 +367,34 @@ class CloudEndureRequester:
     URI_MACHINES = URI_PROJECT + '/machines'
     URI_MACHINE = URI_PROJECT + '/machine/{}'
 
-    URI_REPLICA = URI_PROJECT + '/replicas/{}'
+    URI_REPLICAS = URI_PROJECT + '/replicas'
+    URI_REPLICA = URI_REPLICAS + '/{}'
+
+    URI_REPLICATION_CONFIGURATIONS = URI_PROJECT + '/replicationConfigurations'
+
+    URI_REGIONS = 'cloudCredentials/{}/regions'
+    URI_REGION = URI_REGIONS + '/{}'
+    ON_PREM_CLOUD_CREDENTIALS_ID = '00000000-0000-0000-0000-000000000000'
+
+    # CloudEndure returns at most 1500 items per page
+    DEFAULT_PAGE_SIZE = 1000
+
+    DEFAULT_REPLICA_CONCURRENCY = 8
 
     _cloud_endure_session = None
+    _project_index: CloudEndureProjectIndex = None
+    _machine_indexes: Dict[str, CloudEndureMachineIndex] = {}
 
-    def __init__(self):
-        self._cloud_endure_session = CloudEndureSession()
+    def __init__(self, cloud_endure_session: CloudEndureSession = None):
+        self._cloud_endure_session = cloud_endure_session or CloudEndureSession.get_shared()
+        self._project_index = CloudEndureProjectIndex(self)
+        self._machine_indexes = {}
+
+    def login(self):
+        self._cloud_endure_session.get_session()
+
+    def get_project_index(self) -> CloudEndureProjectIndex:
+        return self._project_index
 
     def get_aws_cloud_id(self):
         response = self.get('clouds')
@@ -127,23 +411,53 @@ class CloudEndureRequester:
                 return license_item['id']
 
     def get_on_prem_region_id(self):
-        response = self.get('cloudCredentials/00000000-0000-0000-0000-000000000000/regions')
-
-        for region_items in response['items']:
+        for region_items in self.iter_items(self.URI_REGIONS.format(self.ON_PREM_CLOUD_CREDENTIALS_ID), page_size=1):
             return region_items['id']
 
     def get_aws_region_id(self, cloud_credentials_id, aws_region):
-        response = self.get('cloudCredentials/{}/regions'.format(cloud_credentials_id))
-        for region in response['items']:
+        for region in self.iter_regions(cloud_credentials_id):
             if region['name'] == self.REGIONS[aws_region]:
                 return region['id']
 
+    def iter_items(self, uri: str, page_size: int = DEFAULT_PAGE_SIZE, refresh: bool = False) -> Iterator[dict]:
+        # Pages are fetched as the items are consumed: callers stopping early skip the remaining pages
+        offset = 0
+        while True:
+            page_uri = '{}{}offset={}&limit={}'.format(uri, '&' if '?' in uri else '?', offset, page_size)
+            if refresh:
+                ResponseCache.evict(
+                    [self._cloud_endure_session.get_api_endpoint().format(page_uri)],
+                    self._cloud_endure_session.get_session()
+                )
+
+            response = self.get(page_uri)
+            items = response.get('items', []) if response else []
+            yield from items
+
+            if len(items) < page_size:
+                return
+
+            offset += len(items)
+
+    def iter_projects(self, page_size: int = DEFAULT_PAGE_SIZE, refresh: bool = False) -> Iterator[dict]:
+        return self.iter_items(self.URI_PROJECTS, page_size, refresh)
+
+    def iter_regions(self, cloud_credentials_id: str, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[dict]:
+        return self.iter_items(self.URI_REGIONS.format(cloud_credentials_id), page_size)
+
+    def iter_machines(self, project_name: str, page_size: int = DEFAULT_PAGE_SIZE, refresh: bool = False):
+        _project_id = self.get_project_id(project_name)
+
+        if not _project_id:
+            return iter([])
+
+        return self.iter_items(self.URI_MACHINES.format(_project_id), page_size, refresh)
+
     def get_project_by_name(self, project_name):
-        response = self.get(self.URI_PROJECTS)
-        for project in response['items']:
-            if project['name'] == project_name:
-                logging.getLogger('root').debug(self.__class__.__name__ + ': ' + str(project))
-                return project
+        project = self._project_index.get_by_name(project_name)
+        if project is not None:
+            logging.getLogger('root').debug(self.__class__.__name__ + ': ' + str(project))
+            return project
 
         logging.getLogger('root').debug(self.__class__.__name__ + ': ' +
                                         str("project") + project_name + str(" not found"))
@@ -164,29 +478,50 @@ class CloudEndureRequester:
         if not _project_id:
             return False
 
-        machines = self.get(self.URI_MACHINES.format(_project_id))
+        machines = {'items': list(self.iter_items(self.URI_MACHINES.format(_project_id)))}
 
-        if not machines:
+        if not machines['items']:
             logging.getLogger('root').debug(self.__class__.__name__ + ': ' +
                                             str("project") + project_name + str(" is empty"))
 
         return machines
 
-    def get_machine(self, project_name: str, machine_name: str):
-        machines = self.get_machines(project_name)
+    def get_machine_index(self, project_name: str, refresh: bool = False):
+        if not refresh and project_name in self._machine_indexes:
+            return self._machine_indexes[project_name]
+
+        if not self.get_project_id(project_name):
+            return None
 
-        if not machines:
+        # A cached machines list would hide the machines registered since the previous round
+        self._machine_indexes[project_name] = CloudEndureMachineIndex(
+            list(self.iter_machines(project_name, refresh=refresh))
+        )
+
+        return self._machine_indexes[project_name]
+
+    def get_machine(self, project_name: str, machine_name: str, refresh: bool = True):
+        machine_index = self.get_machine_index(project_name, refresh=refresh)
+
+        if not machine_index:
             logging.getLogger('root').debug(self.__class__.__name__ + ': ' +
                                             str("project ") + project_name + str(" has no machine"))
             return None
 
-        for machine in machines['items']:
-            if machine_name.lower() == machine['sourceProperties']['name'].lower():
-                logging.getLogger('root').debug(self.__class__.__name__ + ': ' + str("project ") +
-                                                project_name + str(" has a machine ") + machine['sourceProperties']['name'])
-                return machine
+        machine = machine_index.get_by_name(machine_name)
+        if machine is not None:
+            logging.getLogger('root').debug(self.__class__.__name__ + ': ' + str("project ") +
+                                            project_name + str(" has a machine ") + machine['sourceProperties']['name'])
+
+        return machine
+
+    def find_machines(self, project_name: str, names_or_fqdns: List[str], refresh: bool = True) -> Dict[str, dict]:
+        machine_index = self.get_machine_index(project_name, refresh=refresh)
 
-        return None
+        if machine_index is None:
+            return {name_or_fqdn: None for name_or_fqdn in names_or_fqdns}
+
+        return {name_or_fqdn: machine_index.find(name_or_fqdn) for name_or_fqdn in names_or_fqdns}
 
     def get_machine_replica(self, replica_id, project_name):
         _project_id = self.get_project_id(project_name)
@@ -196,10 +531,45 @@ class CloudEndureRequester:
 
         return self.get(self.URI_REPLICA.format(_project_id, replica_id))
 
-    def get_all_project_names(self):
-        response = self.get(self.URI_PROJECTS)
+    def get_machine_replicas(self, project_name: str, replica_ids: List[str],
+                             concurrency: int = DEFAULT_REPLICA_CONCURRENCY) -> Dict[str, dict]:
+        _project_id = self.get_project_id(project_name)
+        replica_ids = list(dict.fromkeys(replica_id for replica_id in replica_ids if replica_id))
+
+        if not _project_id or not replica_ids:
+            return {}
+
+        concurrency = max(1, min(concurrency, len(replica_ids)))
 
-        return list(map(lambda project: project['name'], response['items']))
+        # Logs in once, before workers need the session
+        self._cloud_endure_session.get_session()
+
+        logging.getLogger('root').debug('{}: resolving {} replicas of “{}” with {} workers'.format(
+            self.__class__.__name__, len(replica_ids), project_name, concurrency
+        ))
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            replicas = executor.map(
+                lambda replica_id: self.get(self.URI_REPLICA.format(_project_id, replica_id)), replica_ids
+            )
+
+            return dict(zip(replica_ids, replicas))
+
+    def get_machine_cloud_ids(self, project_name: str, machines: List[dict],
+                              concurrency: int = DEFAULT_REPLICA_CONCURRENCY) -> Dict[str, str]:
+        replica_ids_by_machine_name = {
+            machine['sourceProperties']['name']: machine['replica'] for machine in machines if machine.get('replica')
+        }
+        replicas = self.get_machine_replicas(project_name, list(replica_ids_by_machine_name.values()), concurrency)
+
+        return {
+            machine_name: replicas[replica_id]['machineCloudId']
+            for machine_name, replica_id in replica_ids_by_machine_name.items()
+            if replicas.get(replica_id) and 'machineCloudId' in replicas[replica_id]
+        }
+
+    def get_all_project_names(self):
+        return list(map(lambda project: project['name'], self._project_index.get_all()))
 
     def get_api_token(self, project_name: str):
         project = self.get_project_by_name(project_name)
@@ -215,31 +585,67 @@ class CloudEndureRequester:
         return project['agentInstallationToken']
 
     def get(self, uri):
-        return Requester.get(
-            uri=self._cloud_endure_session.get_api_endpoint().format(uri),
-            request_instance=self._cloud_endure_session.get_session()
-        )
+        return self._request('get', uri)
 
     def post(self, uri, data=None):
-        return Requester.post(
-            uri=self._cloud_endure_session.get_api_endpoint().format(uri),
-            data=json.dumps(data),
-            request_instance=self._cloud_endure_session.get_session()
-        )
+        response = self._request('post', uri, data=json.dumps(data))
+        self._invalidate_projects(uri)
+
+        return response
 
     def patch(self, uri, data=None):
-        return Requester.patch(
-            uri=self._cloud_endure_session.get_api_endpoint().format(uri),
-            data=json.dumps(data),
-            request_instance=self._cloud_endure_session.get_session()
+        response = self._request('patch', uri, data=json.dumps(data))
+        self._invalidate_projects(uri)
+
+        return response
+
+    def delete(self, uri, data=None, exit_on_error=True):
+        response = self._request(
+            'delete', uri, exit_on_error=exit_on_error, data=json.dumps(data) if data is not None else None
         )
+        self._invalidate_projects(uri)
 
-    def delete(self, uri):
-        return Requester.delete(
+        return response
+
+    def _request(self, verb, uri, exit_on_error=True, **kwargs):
+        session = self._cloud_endure_session.get_session()
+        try:
+            return getattr(Requester, verb)(
+                uri=self._cloud_endure_session.get_api_endpoint().format(uri),
+                request_instance=session,
+                exit_on_error=False,
+                **kwargs
+            )
+        except RequestError as error:
+            if error.status_code != 401:
+                if exit_on_error:
+                    logging.getLogger('root').error('{}: {}'.format(self.__class__.__name__, error))
+                    sys.exit(50)
+                raise
+
+        # Stored sessions and sessions of long polling loops both expire: one new login, then the request fails
+        was_from_store = self._cloud_endure_session.discard_session(session)
+        logging.getLogger('root').warning('{}: {} CloudEndure session was rejected, logging in again.'.format(
+            self.__class__.__name__, 'stored' if was_from_store else 'expired'
+        ))
+
+        return getattr(Requester, verb)(
             uri=self._cloud_endure_session.get_api_endpoint().format(uri),
             request_instance=self._cloud_endure_session.get_session(),
+            exit_on_error=exit_on_error,
+            **kwargs
         )
 
+    @classmethod
+    def is_project_uri(cls, uri: str):
+        return re.match('^' + cls.URI_PROJECTS + '(/[^/]+)?/?$', uri) is not None
+
+    def _invalidate_projects(self, uri: str):
+        if not self.is_project_uri(uri):
+            return
+
+        self._project_index.invalidate()
+
 
 if __name__ == '__main__':
     print("This file is a library file. It cannot be called directly.")
@@ -1,18 +1,27 @@
 #!/usr/bin/env python3
 
+import base64
+import binascii
 import json
 import logging
+import os
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, List, Dict
 
+import requests
 import requests_cache
 
 from mf.aws import AWSValidator
 from . import ENV_VAR_MIGRATION_FACTORY_PASSWORD
 from . import ENV_VAR_MIGRATION_FACTORY_USERNAME
+from . import FILE_MIGRATION_FACTORY_TOKENS, PATH_CACHE
+from .cache import ResponseCache
 from .utils import EnvironmentVariableFetcher, MessageBag
-from .utils import Requester
+from .utils import HttpSessionPool, JsonStreamDecoder, PrivateJsonFile, RateLimiter, RequestError, Requester
 
 
 class MfField:
@@ -355,6 +364,59 @@ class MigrationFactoryDataValidator:
         ))
 
 
+class MigrationFactoryTokenStore:
+    """
+        Persists Migration Factory authorization tokens, with their expiry, in a file readable by the user only.
+        Tokens are reused across script invocations until they are about to expire.
+    """
+
+    REFRESH_MARGIN = 300
+
+    _file: PrivateJsonFile = None
+
+    def __init__(self, path: str = None):
+        self._file = PrivateJsonFile(
+            path if path is not None else os.path.join(PATH_CACHE, FILE_MIGRATION_FACTORY_TOKENS)
+        )
+
+    def load(self, key: str):
+        stored_token = self._file.read().get(key)
+        if not stored_token or not self.is_fresh(stored_token.get('expires_at')):
+            return None
+
+        return stored_token['token']
+
+    def save(self, key: str, token: str):
+        expires_at = self.get_expiry(token)
+        if expires_at is None:
+            logging.getLogger('root').debug('{}: token has no readable expiry, it will not be stored'.format(
+                self.__class__.__name__
+            ))
+            return
+
+        stored_tokens = self._file.read()
+        stored_tokens[key] = {'token': token, 'expires_at': expires_at}
+        self._file.write(stored_tokens)
+
+    def discard(self, key: str):
+        stored_tokens = self._file.read()
+        if stored_tokens.pop(key, None) is not None:
+            self._file.write(stored_tokens)
+
+    @classmethod
+    def get_expiry(cls, token: str):
+        try:
+            payload = token.split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            return float(claims['exp'])
+        except (IndexError, KeyError, TypeError, ValueError, binascii.Error):
+            return None
+
+    @classmethod
+    def is_fresh(cls, expires_at):
+        return expires_at is None or time.time() + cls.REFRESH_MARGIN < expires_at
+
+
 class MigrationFactoryAuthenticator:
     """ Allow to login to the migration Migration Factory and store authorization token """
 
@@ -362,6 +424,10 @@ class MigrationFactoryAuthenticator:
     _password = None
     _login_api_url = None
     _authorization_token = None
+    _token_expiry = None
+    _is_token_from_store = False
+    _token_store: MigrationFactoryTokenStore = None
+    _lock = None
 
     URI_LOGIN = 'prod/login'
 
@@ -373,22 +439,60 @@ class MigrationFactoryAuthenticator:
             ENV_VAR_MIGRATION_FACTORY_PASSWORD, env_var_description='Migration Factory password', sensitive=True
         )
         self._login_api_url = login_api_url
+        self._token_store = MigrationFactoryTokenStore()
+        self._lock = threading.Lock()
 
     def login(self):
-        self._authorization_token = Requester.post(
+        authorization_token = Requester.post(
             url=self._login_api_url,
             uri=self.URI_LOGIN,
             data=json.dumps({'username': self._username, 'password': self._password})
         ).strip('"')
 
+        self._set_authorization_token(authorization_token, is_from_store=False)
+        self._token_store.save(self._get_store_key(), authorization_token)
+
         return self._authorization_token
 
     def get_authorization_token(self):
-        if self._authorization_token is None:
-            return self.login()
+        if not self._is_token_valid():
+            with self._lock:
+                if not self._is_token_valid():
+                    self._refresh_authorization_token()
 
         return self._authorization_token
 
+    def discard_authorization_token(self):
+        # A rejected token is only worth a new login if it was reused from the store
+        with self._lock:
+            was_from_store = self._is_token_from_store
+            self._token_store.discard(self._get_store_key())
+            self._set_authorization_token(None, is_from_store=False)
+
+        return was_from_store
+
+    def _refresh_authorization_token(self):
+        stored_token = self._token_store.load(self._get_store_key())
+
+        if stored_token is None:
+            self.login()
+            return
+
+        logging.getLogger('root').debug('{}: reusing stored authorization token'.format(self.__class__.__name__))
+        self._set_authorization_token(stored_token, is_from_store=True)
+
+    def _set_authorization_token(self, authorization_token, is_from_store: bool):
+        self._authorization_token = authorization_token
+        self._token_expiry = MigrationFactoryTokenStore.get_expiry(authorization_token) if authorization_token else None
+        self._is_token_from_store = is_from_store
+
+    def _is_token_valid(self):
+        # Long-running scripts refresh the token shortly before it expires
+        return self._authorization_token is not None and MigrationFactoryTokenStore.is_fresh(self._token_expiry)
+
+    def _get_store_key(self):
+        return '{}@{}'.format(self._username, self._login_api_url)
+
     def populate_headers_with_authorization(self, headers):
         if headers is None:
             headers = {}
@@ -396,11 +500,334 @@ class MigrationFactoryAuthenticator:
         return {**headers, **{"Authorization": self.get_authorization_token()}}
 
 
+class MigrationFactoryCatalog:
+    """
+        In-memory index of the waves, apps and servers of the Migration Factory.
+        Each list endpoint is fetched once, then every lookup is answered from hash indexes until its TTL expires,
+        so that long-running scripts see the changes made by others.
+        Writes made through the requester are applied to the catalog (write-through).
+        Records can be reduced to the fields a script uses, on top of the indexed ones, to save memory.
+    """
+
+    RESOURCE_WAVES = 'waves'
+    RESOURCE_APPS = 'apps'
+    RESOURCE_SERVERS = 'servers'
+
+    DEFAULT_TTL = 30
+
+    INDEX_BY_WAVE_ID = 'by_' + MfField.WAVE_ID
+    INDEX_BY_APP_ID = 'by_' + MfField.APP_ID
+
+    # For each resource: (index name, indexed key, whether many records share a value, other mandatory key)
+    INDEXES = {
+        RESOURCE_WAVES: [
+            (MfField.WAVE_ID, MfField.WAVE_ID, False, None),
+            (MfField.WAVE_NAME, MfField.WAVE_NAME, False, None),
+        ],
+        RESOURCE_APPS: [
+            (MfField.APP_ID, MfField.APP_ID, False, None),
+            # Apps without wave are not reachable by name, like it always was
+            (MfField.APP_NAME, MfField.APP_NAME, False, MfField.WAVE_ID),
+            (INDEX_BY_WAVE_ID, MfField.WAVE_ID, True, None),
+        ],
+        RESOURCE_SERVERS: [
+            (MfField.SERVER_ID, MfField.SERVER_ID, False, None),
+            (MfField.SERVER_NAME, MfField.SERVER_NAME, False, None),
+            (INDEX_BY_APP_ID, MfField.APP_ID, True, None),
+        ],
+    }
+
+    IDENTIFIERS = {
+        RESOURCE_WAVES: MfField.WAVE_ID,
+        RESOURCE_APPS: MfField.APP_ID,
+        RESOURCE_SERVERS: MfField.SERVER_ID,
+    }
+
+    _requester = None
+    _ttl: float = DEFAULT_TTL
+    # Resource → fields kept from each record, all fields when the resource is absent
+    _fields: Dict[str, List[str]] = {}
+    # Resource → records by object id, in list order: records are removed without scanning the list
+    _records: Dict[str, Dict[int, dict]] = {}
+    _indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    _expires_at: Dict[str, float] = {}
+    _lock = None
+
+    def __init__(self, requester, fields: Dict[str, List[str]] = None, ttl: float = DEFAULT_TTL):
+        self._requester = requester
+        self._ttl = ttl
+        self._fields = {
+            resource: self._with_indexed_fields(resource, resource_fields)
+            for resource, resource_fields in (fields or {}).items()
+        }
+        self._records = {}
+        self._indexes = {}
+        self._expires_at = {}
+        # Writes may come from bulk operation workers
+        self._lock = threading.RLock()
+
+    def get_wave_by_name(self, wave_name: str):
+        return self._get_index(self.RESOURCE_WAVES, MfField.WAVE_NAME).get(wave_name)
+
+    def get_wave_by_id(self, wave_id):
+        return self._get_index(self.RESOURCE_WAVES, MfField.WAVE_ID).get(str(wave_id))
+
+    def get_app_by_name(self, app_name: str):
+        return self._get_index(self.RESOURCE_APPS, MfField.APP_NAME).get(app_name)
+
+    def get_app_by_id(self, app_id):
+        return self._get_index(self.RESOURCE_APPS, MfField.APP_ID).get(str(app_id))
+
+    def get_apps_by_wave_id(self, wave_id) -> List[dict]:
+        return list(self._get_index(self.RESOURCE_APPS, self.INDEX_BY_WAVE_ID).get(str(wave_id), {}).values())
+
+    def get_server_by_name(self, server_name: str):
+        return self._get_index(self.RESOURCE_SERVERS, MfField.SERVER_NAME).get(server_name)
+
+    def get_server_by_id(self, server_id):
+        return self._get_index(self.RESOURCE_SERVERS, MfField.SERVER_ID).get(str(server_id))
+
+    def get_servers_by_app_id(self, app_id) -> List[dict]:
+        return list(self._get_index(self.RESOURCE_SERVERS, self.INDEX_BY_APP_ID).get(str(app_id), {}).values())
+
+    def get_servers(self) -> List[dict]:
+        return list(self._get_records(self.RESOURCE_SERVERS).values())
+
+    def invalidate(self, uri: str = None):
+        resource = self.guess_resource(uri) if uri is not None else None
+
+        with self._lock:
+            if resource is None:
+                logging.getLogger('root').debug('{}: invalidating the whole catalog'.format(self.__class__.__name__))
+                self._records = {}
+                self._indexes = {}
+                return
+
+            logging.getLogger('root').debug('{}: invalidating “{}”'.format(self.__class__.__name__, resource))
+            self._records.pop(resource, None)
+            self._indexes.pop(resource, None)
+
+    def write_through(self, verb: str, uri: str, data=None, response=None):
+        with self._lock:
+            self._write_through(verb, uri, data, response)
+
+    def _write_through(self, verb: str, uri: str, data=None, response=None):
+        resource = self.guess_resource(uri)
+
+        if resource is None or resource not in self._records:
+            return
+
+        identifier = self.guess_identifier(uri)
+
+        if verb == 'post' and identifier is None and isinstance(response, dict) \
+                and self.IDENTIFIERS[resource] in response:
+            # The response is also returned to the caller: the catalog keeps its own copy
+            self._add(resource, JsonStreamDecoder.project(dict(response), self._fields.get(resource)))
+            return
+
+        record = self._get_index(resource, self.IDENTIFIERS[resource]).get(identifier)
+        changes = self._decode_payload(data)
+
+        if verb == 'put' and record is not None and changes is not None:
+            # Records already handed out to callers are left untouched: the index gets an updated copy
+            self._remove(resource, record)
+            self._add(resource, JsonStreamDecoder.project({**record, **changes}, self._fields.get(resource)))
+            return
+
+        if verb == 'delete' and record is not None:
+            self._remove(resource, record)
+            return
+
+        self.invalidate(uri)
+
+    @classmethod
+    def guess_resource(cls, uri: str):
+        match = re.match('.*/user/(waves|apps|servers)(/.*)?$', uri)
+        if not match:
+            return None
+
+        return match.group(1)
+
+    @classmethod
+    def guess_identifier(cls, uri: str):
+        match = re.match('.*/user/(?:waves|apps|servers)/([^/]+)$', uri)
+        if not match:
+            return None
+
+        return match.group(1)
+
+    def _get_records(self, resource: str) -> Dict[int, dict]:
+        with self._lock:
+            self._ensure_loaded(resource)
+
+            return self._records[resource]
+
+    def _get_index(self, resource: str, index_name: str) -> Dict[str, Any]:
+        with self._lock:
+            self._ensure_loaded(resource)
+
+            return self._indexes[resource][index_name]
+
+    def _ensure_loaded(self, resource: str):
+        if resource in self._records and time.monotonic() < self._expires_at[resource]:
+            return
+
+        self._load(resource)
+
+    def _load(self, resource: str):
+        # Reloads must not be answered by the response cache, whose lists can be older than the catalog
+        refresh = resource in self._expires_at
+        self._records[resource] = {}
+        self._indexes[resource] = {index[0]: {} for index in self.INDEXES[resource]}
+
+        # Items are decoded and indexed one at a time (see JsonStreamDecoder)
+        for record in self._requester.iter_user_list(resource, fields=self._fields.get(resource), refresh=refresh):
+            self._add(resource, record)
+        self._expires_at[resource] = time.monotonic() + self._ttl
+
+        logging.getLogger('root').debug('{}: {} “{}” indexed'.format(
+            self.__class__.__name__, len(self._records[resource]), resource
+        ))
+
+    @classmethod
+    def _with_indexed_fields(cls, resource: str, fields: List[str]) -> List[str]:
+        # Projected records must stay reachable through every index
+        indexed_fields = [cls.IDENTIFIERS[resource]]
+        for _, key, _, mandatory_key in cls.INDEXES[resource]:
+            indexed_fields += [key] + ([mandatory_key] if mandatory_key is not None else [])
+
+        return list(dict.fromkeys(indexed_fields + list(fields)))
+
+    def _add(self, resource: str, record: dict):
+        self._records[resource][id(record)] = record
+
+        for index_name, key, grouped, mandatory_key in self.INDEXES[resource]:
+            if key not in record or (mandatory_key is not None and mandatory_key not in record):
+                continue
+
+            index = self._indexes[resource][index_name]
+            if grouped:
+                index.setdefault(self._index_key(key, record[key]), {})[id(record)] = record
+            else:
+                # First occurrence wins, as the former linear scans did
+                index.setdefault(self._index_key(key, record[key]), record)
+
+    def _remove(self, resource: str, record: dict):
+        self._records[resource].pop(id(record), None)
+
+        for index_name, key, grouped, _ in self.INDEXES[resource]:
+            if key not in record:
+                continue
+
+            index = self._indexes[resource][index_name]
+            index_key = self._index_key(key, record[key])
+            if grouped and index_key in index:
+                index[index_key].pop(id(record), None)
+            elif index.get(index_key) is record:
+                del index[index_key]
+
+    @classmethod
+    def _index_key(cls, key: str, value):
+        if key in [MfField.WAVE_NAME, MfField.APP_NAME, MfField.SERVER_NAME]:
+            return value
+
+        return str(value)
+
+    @classmethod
+    def _decode_payload(cls, data):
+        if isinstance(data, dict):
+            return data
+
+        try:
+            decoded = json.loads(data)
+        except (TypeError, ValueError):
+            return None
+
+        if not isinstance(decoded, dict):
+            return None
+
+        return decoded
+
+
+class BulkOperation:
+    """ Data object representing one write of a bulk mutation against the Migration Factory """
+
+    VERB_POST = 'post'
+    VERB_PUT = 'put'
+    VERB_DELETE = 'delete'
+
+    _verb: str = None
+    _uri: str = None
+    _data: str = None
+    _response_type: str = None
+    _reference = None
+
+    def __init__(self, verb: str, uri: str, data: str = None, response_type: str = Requester.RESPONSE_TYPE_JSON,
+                 reference=None):
+        if verb not in [self.VERB_POST, self.VERB_PUT, self.VERB_DELETE]:
+            raise ValueError('“{}” is not a valid bulk operation verb.'.format(verb))
+
+        self._verb = verb
+        self._uri = uri
+        self._data = data
+        self._response_type = response_type
+        self._reference = reference
+
+    def __str__(self):
+        return '{} {}'.format(self._verb.upper(), self._uri)
+
+    def get_verb(self):
+        return self._verb
+
+    def get_uri(self):
+        return self._uri
+
+    def get_payload(self):
+        if self._verb == self.VERB_DELETE:
+            return {}
+
+        return {'data': self._data}
+
+    def get_response_type(self):
+        return self._response_type
+
+    def get_reference(self):
+        return self._reference
+
+
+class BulkOperationResult:
+    """ Data object representing the outcome of a bulk operation """
+
+    _operation: BulkOperation = None
+    _response = None
+    _error: Exception = None
+
+    def __init__(self, operation: BulkOperation, response=None, error: Exception = None):
+        self._operation = operation
+        self._response = response
+        self._error = error
+
+    def get_operation(self):
+        return self._operation
+
+    def get_response(self):
+        return self._response
+
+    def get_error(self):
+        return self._error
+
+    def is_success(self):
+        return self._error is None
+
+
 class MigrationFactoryRequester:
     """ Allow to make requests against the Migration Factory """
 
+    DEFAULT_BULK_CONCURRENCY = 8
+
     URI_ADMIN_SCHEMA = '/prod/admin/schema/app'
 
+    URI_USER_LIST = '/prod/user/{}'
     URI_USER_SERVER_LIST = '/prod/user/servers'
     URI_USER_SERVER = '/prod/user/servers/{}'
     URI_USER_APP_LIST = '/prod/user/apps'
@@ -411,67 +838,146 @@ class MigrationFactoryRequester:
 
     _migration_factory_authenticator = None
     _endpoints_loader = None
+    _catalog: MigrationFactoryCatalog = None
 
-    def __init__(self, endpoints_loader):
+    def __init__(self, endpoints_loader, catalog_fields: Dict[str, List[str]] = None):
         self._migration_factory_authenticator = MigrationFactoryAuthenticator(endpoints_loader.get_login_api_url())
         self._endpoints_loader = endpoints_loader
-        requests_cache.install_cache('migration_factory', backend='memory', expire_after=30)
+        # Scripts using a few fields only keep those in memory: see MigrationFactoryCatalog
+        self._catalog = MigrationFactoryCatalog(self, catalog_fields)
+        ResponseCache.install()
 
     @classmethod
     def clear_cache(cls):
         requests_cache.clear()
 
+    @classmethod
+    def evict_cache(cls, url: str, uri: str, headers: dict = None):
+        urls_to_evict = [uri]
+        resource = MigrationFactoryCatalog.guess_resource(uri)
+        if resource is not None:
+            urls_to_evict.append(cls.URI_USER_LIST.format(resource))
+
+        urls_to_evict = [url.rstrip('/') + '/' + uri_to_evict.lstrip('/') for uri_to_evict in urls_to_evict]
+        ResponseCache.evict(urls_to_evict, HttpSessionPool.get_session(urls_to_evict[0]), headers)
+
+    def get_catalog(self) -> MigrationFactoryCatalog:
+        return self._catalog
+
+    def get_authenticator(self) -> MigrationFactoryAuthenticator:
+        return self._migration_factory_authenticator
+
+    def iter_user_list(self, resource: str, fields: List[str] = None, refresh: bool = False):
+        uri = self.URI_USER_LIST.format(resource)
+        url = self._guess_url(uri)
+        if refresh:
+            self.evict_cache(url, uri, self._migration_factory_authenticator.populate_headers_with_authorization(None))
+
+        return self._request(
+            'get_stream',
+            uri=uri,
+            url=url,
+            headers=None,
+            fields=fields,
+        )
+
     def get(self, uri, url=None, headers=None, response_type=Requester.RESPONSE_TYPE_JSON):
         if url is None:
             url = self._guess_url(uri)
 
-        return Requester.get(
+        return self._request(
+            'get',
             uri=uri,
             url=url,
-            headers=self._migration_factory_authenticator.populate_headers_with_authorization(headers),
+            headers=headers,
             response_type=response_type,
         )
 
-    def put(self, uri, url=None, headers=None, data=None, response_type=Requester.RESPONSE_TYPE_JSON):
+    def put(self, uri, url=None, headers=None, data=None, response_type=Requester.RESPONSE_TYPE_JSON,
+            exit_on_error=True):
         if url is None:
             url = self._guess_url(uri)
 
-        self.clear_cache()
-
-        return Requester.put(
+        response = self._request(
+            'put',
             uri=uri,
             url=url,
-            headers=self._migration_factory_authenticator.populate_headers_with_authorization(headers),
+            headers=headers,
             data=data,
             response_type=response_type,
+            exit_on_error=exit_on_error,
         )
+        self.evict_cache(url, uri, self._migration_factory_authenticator.populate_headers_with_authorization(headers))
+        self._catalog.write_through('put', uri, data, response)
+
+        return response
 
-    def post(self, uri, url=None, headers=None, data=None, response_type=Requester.RESPONSE_TYPE_JSON):
+    def post(self, uri, url=None, headers=None, data=None, response_type=Requester.RESPONSE_TYPE_JSON,
+             exit_on_error=True):
         if url is None:
             url = self._guess_url(uri)
 
-        self.clear_cache()
-
-        return Requester.post(
+        response = self._request(
+            'post',
             uri=uri,
             url=url,
-            headers=self._migration_factory_authenticator.populate_headers_with_authorization(headers),
+            headers=headers,
             data=data,
             response_type=response_type,
+            exit_on_error=exit_on_error,
         )
+        self.evict_cache(url, uri, self._migration_factory_authenticator.populate_headers_with_authorization(headers))
+        self._catalog.write_through('post', uri, data, response)
+
+        return response
 
-    def delete(self, uri, url=None, headers=None, response_type=Requester.RESPONSE_TYPE_JSON):
+    def delete(self, uri, url=None, headers=None, response_type=Requester.RESPONSE_TYPE_JSON, exit_on_error=True):
         if url is None:
             url = self._guess_url(uri)
 
-        self.clear_cache()
-
-        return Requester.delete(
+        response = self._request(
+            'delete',
             uri=uri,
             url=url,
-            headers=self._migration_factory_authenticator.populate_headers_with_authorization(headers),
+            headers=headers,
             response_type=response_type,
+            exit_on_error=exit_on_error,
         )
+        self.evict_cache(url, uri, self._migration_factory_authenticator.populate_headers_with_authorization(headers))
+        self._catalog.write_through('delete', uri)
+
+        return response
+
+    def bulk(self, operations: List[BulkOperation], concurrency: int = DEFAULT_BULK_CONCURRENCY,
+             rate_limit: float = None) -> List[BulkOperationResult]:
+        if not operations:
+            return []
+
+        concurrency = max(1, min(concurrency, len(operations)))
+        rate_limiter = RateLimiter(rate_limit)
+        HttpSessionPool.ensure_pool_size(concurrency)
+
+        # Logs in once, before workers need the token
+        self._migration_factory_authenticator.get_authorization_token()
+
+        logging.getLogger('root').info('{}: running {} operations with {} workers (rate limit: {}/s)'.format(
+            self.__class__.__name__, len(operations), concurrency, rate_limit or '∞'
+        ))
+
+        def run(operation: BulkOperation) -> BulkOperationResult:
+            rate_limiter.acquire()
+            try:
+                return BulkOperationResult(operation, response=getattr(self, operation.get_verb())(
+                    operation.get_uri(),
+                    response_type=operation.get_response_type(),
+                    exit_on_error=False,
+                    **operation.get_payload()
+                ))
+            except (RequestError, requests.RequestException) as error:
+                return BulkOperationResult(operation, error=error)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(run, operations))
 
     def get_user_apps_by_wave_name(self, wave_name: str):
         wave = self.get_user_wave_by_name(wave_name)
@@ -481,56 +987,32 @@ class MigrationFactoryRequester:
         return self.get_user_apps_by_wave_id(wave[MfField.WAVE_ID])
 
     def get_user_apps_by_wave_id(self, wave_id: str):
-        all_apps = self.get(uri=self.URI_USER_APP_LIST)
-
-        apps = []
-        for app in all_apps:
-            if MfField.WAVE_ID in app and app[MfField.WAVE_ID] == wave_id:
-                apps.append(app)
-
-        return apps
+        return self._catalog.get_apps_by_wave_id(wave_id)
 
     def get_user_app_by_name(self, app_name):
-        all_apps = self.get(uri=self.URI_USER_APP_LIST)
-
-        for app in all_apps:
-            if MfField.WAVE_ID in app and app[MfField.APP_NAME] == app_name:
-                return app
-
-        return None
+        return self._catalog.get_app_by_name(app_name)
 
     def get_user_wave_by_name(self, wave_name):
-        all_waves = self.get(uri=self.URI_USER_WAVE_LIST)
-
-        for wave in all_waves:
-            if wave[MfField.WAVE_NAME] == wave_name:
-                return wave
+        wave = self._catalog.get_wave_by_name(wave_name)
 
-        logging.getLogger('root').error('{}: wave “{}” not found'.format(
-            self.__class__.__name__, wave_name
-        ))
+        if wave is None:
+            logging.getLogger('root').error('{}: wave “{}” not found'.format(
+                self.__class__.__name__, wave_name
+            ))
 
-        return None
+        return wave
 
     def get_user_server_by_name(self, server_name):
-        all_servers = self.get(uri=self.URI_USER_SERVER_LIST)
-
-        for server in all_servers:
-            if server[MfField.SERVER_NAME] == server_name:
-                return server
-
-        return None
+        return self._catalog.get_server_by_name(server_name)
 
     def get_user_servers_by_wave_name(self, wave_name):
         wave = self.get_user_wave_by_name(wave_name)
-        all_apps = self.get_user_apps_by_wave_id(wave[MfField.WAVE_ID])
-        all_servers = self.get(uri=self.URI_USER_SERVER_LIST)
+        if wave is None:
+            return None
 
         filtered_servers = []
-        for app in all_apps:
-            for server in all_servers:
-                if server[MfField.APP_ID] == app[MfField.APP_ID]:
-                    filtered_servers.append(server)
+        for app in self.get_user_apps_by_wave_id(wave[MfField.WAVE_ID]):
+            filtered_servers += self._catalog.get_servers_by_app_id(app[MfField.APP_ID])
 
         if not filtered_servers:
             return None
@@ -538,62 +1020,32 @@ class MigrationFactoryRequester:
         return filtered_servers
 
     def get_user_server_ids(self, filter_app_id=None):
-        _server_list = self.get(self.URI_USER_SERVER_LIST)
-
-        _server_selected_list_id = []
-
-        for server in _server_list:
-            if filter_app_id:
-                if MfField.APP_ID in server and server[MfField.APP_ID] == filter_app_id:
-                    _server_selected_list_id.append(server[MfField.SERVER_ID])
-                else:
-                    logging.getLogger('root').debug('{}: server id “{}” filtered (not in app {})'.format(
-                        self.__class__.__name__, server[MfField.SERVER_ID], filter_app_id
-                    ))
-            else:
-                _server_selected_list_id.append(server[MfField.SERVER_ID])
+        if filter_app_id:
+            _server_list = self._catalog.get_servers_by_app_id(filter_app_id)
+        else:
+            _server_list = self._catalog.get_servers()
 
-        return _server_selected_list_id
+        return list(map(lambda server: server[MfField.SERVER_ID], _server_list))
 
     def get_user_servers_by_wave(self, filter_wave_name: str):
-        _server_list = self.get(self.URI_USER_SERVER_LIST)
-
-        _server_selected_list_id = []
-
-        for server in _server_list:
-            app = self.get(self.URI_USER_APP.format(server[MfField.APP_ID]))
-            if app is None:
-                logging.getLogger('root').warning('{}: server id “{}” is orphan of any app…'.format(
-                    self.__class__.__name__, server[MfField.SERVER_ID]
-                ))
-                continue
-
-            wave = self.get(self.URI_USER_WAVE.format(app[MfField.WAVE_ID]))
-            if wave is None:
-                logging.getLogger('root').warning('{}: server id “{}” app is orphan of any wave…'.format(
-                    self.__class__.__name__, server[MfField.SERVER_ID]
-                ))
-                continue
-
-            if MfField.WAVE_NAME in wave and wave[MfField.WAVE_NAME] == filter_wave_name:
-                _server_selected_list_id.append(server)
-            else:
-                logging.getLogger('root').debug('{}: server id “{}” filtered (not in wave {})'.format(
-                    self.__class__.__name__, server[MfField.SERVER_ID], filter_wave_name
-                ))
+        # Follows the catalog indexes from the wave to its apps, then to their servers: no list is scanned
+        wave = self._catalog.get_wave_by_name(filter_wave_name)
+        if wave is None:
+            return []
 
-        return _server_selected_list_id
+        return [
+            server
+            for app in self._catalog.get_apps_by_wave_id(wave[MfField.WAVE_ID])
+            for server in self._catalog.get_servers_by_app_id(app[MfField.APP_ID])
+        ]
 
     def get_user_servers_by_wave_and_os(self, filter_wave_name, filter_os):
-        _server_list = self.get_user_servers_by_wave(filter_wave_name=filter_wave_name)
-
-        _server_selected_list_id = []
-        if _server_list:
-            for server in _server_list:
-                if server[MfField.SERVER_OS].lower().strip() == filter_os.lower().strip():
-                    _server_selected_list_id.append(server)
+        _filter_os = filter_os.lower().strip()
 
-        return _server_selected_list_id
+        return [
+            server for server in self.get_user_servers_by_wave(filter_wave_name=filter_wave_name)
+            if server.get(MfField.SERVER_OS, '').lower().strip() == _filter_os
+        ]
 
     def launch_target(
             self,
@@ -632,6 +1084,34 @@ class MigrationFactoryRequester:
 
         return
 
+    def _request(self, verb, uri, url, headers, exit_on_error=True, **kwargs):
+        try:
+            return getattr(Requester, verb)(
+                uri=uri,
+                url=url,
+                headers=self._migration_factory_authenticator.populate_headers_with_authorization(headers),
+                exit_on_error=False,
+                **kwargs
+            )
+        except RequestError as error:
+            if error.status_code != 401 or not self._migration_factory_authenticator.discard_authorization_token():
+                if exit_on_error:
+                    logging.getLogger('root').error('{}: {}'.format(self.__class__.__name__, error))
+                    sys.exit(50)
+                raise
+
+        logging.getLogger('root').warning('{}: stored authorization token was rejected, logging in again.'.format(
+            self.__class__.__name__
+        ))
+
+        return getattr(Requester, verb)(
+            uri=uri,
+            url=url,
+            headers=self._migration_factory_authenticator.populate_headers_with_authorization(headers),
+            exit_on_error=exit_on_error,
+            **kwargs
+        )
+
     def _guess_url(self, uri):
         if self._has_user_uri(uri):
             return self._endpoints_loader.get_user_api_url()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+import datetime
+import logging
+import os
+import re
+from typing import Dict, List
+
+from . import FILE_REPLICATION_TELEMETRY, PATH_CACHE
+from .utils import PrivateJsonFile
+
+
+class ReplicationPollScheduler:
+    """
+        Picks the delay before the next replication status round instead of polling at a fixed pace.
+        The delay follows the nearest initial sync ETA and how fast the replication lags are shrinking.
+    """
+
+    MIN_INTERVAL = 60
+    DEFAULT_INTERVAL = 300
+    MAX_INTERVAL = 900
+
+    # Below this lag, in seconds, a machine is in continuous data replication
+    LAG_THRESHOLD = 300
+
+    _min_interval: float = MIN_INTERVAL
+    _max_interval: float = MAX_INTERVAL
+    _round_at: datetime.datetime = None
+    _previous_round_at: datetime.datetime = None
+    _lags: Dict[str, float] = {}
+    _previous_lags: Dict[str, float] = {}
+    _candidates: List[float] = []
+
+    def __init__(self, min_interval: float = MIN_INTERVAL, max_interval: float = MAX_INTERVAL):
+        self._min_interval = min_interval
+        self._max_interval = max(min_interval, max_interval)
+        self._round_at = None
+        self._previous_round_at = None
+        self._lags = {}
+        self._previous_lags = {}
+        self._candidates = []
+
+    def start_round(self, now: datetime.datetime = None):
+        self._previous_round_at = self._round_at
+        self._round_at = now or datetime.datetime.utcnow()
+        self._previous_lags = self._lags
+        self._lags = {}
+        self._candidates = []
+
+    def get_round_datetime(self) -> datetime.datetime:
+        return self._round_at
+
+    def observe(self, machine_name: str, replication_info: dict):
+        if 'lastConsistencyDateTime' not in replication_info:
+            eta = self.parse_datetime(replication_info.get('nextConsistencyEstimatedDateTime'))
+            if eta is not None:
+                self.add_estimation(eta)
+            return
+
+        last_consistency = self.parse_datetime(replication_info['lastConsistencyDateTime'])
+        if last_consistency is None:
+            return
+
+        lag = (self._round_at - last_consistency).total_seconds()
+        self._lags[machine_name] = lag
+        previous_lag = self._previous_lags.get(machine_name)
+
+        if lag <= self.LAG_THRESHOLD or previous_lag is None or lag >= previous_lag:
+            return
+
+        elapsed = (self._round_at - self._previous_round_at).total_seconds()
+        if elapsed <= 0:
+            return
+
+        # Shrinking lag: come back when it should be under the threshold
+        catch_up_rate = (previous_lag - lag) / elapsed
+        self._candidates.append((lag - self.LAG_THRESHOLD) / catch_up_rate)
+
+    def add_estimation(self, eta: datetime.datetime):
+        # A past ETA says nothing about when to come back: the minimum interval would be used
+        if eta > self._round_at:
+            self._candidates.append((eta - self._round_at).total_seconds())
+
+    def get_next_interval(self) -> float:
+        interval = min(self._candidates) if self._candidates else self.DEFAULT_INTERVAL
+        interval = min(max(interval, self._min_interval), self._max_interval)
+
+        logging.getLogger('root').debug('{}: next round in {:.0f} seconds ({} estimations)'.format(
+            self.__class__.__name__, interval, len(self._candidates)
+        ))
+
+        return interval
+
+    @classmethod
+    def parse_datetime(cls, value: str = None):
+        # CloudEndure dates are UTC ISO 8601, with a variable number of fraction digits
+        if not value:
+            return None
+
+        try:
+            return datetime.datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S')
+        except ValueError:
+            return None
+
+
+class ReplicationTelemetry:
+    """
+        Time series of the replication progress of a wave: remaining bytes of every machine at every poll.
+        Kept on disk between runs, it gives the throughput and completion ETA of each machine and of the wave.
+    """
+
+    MAX_SAMPLES = 120
+    # Throughput is measured over the samples of the last hour, older ones are dropped
+    THROUGHPUT_WINDOW = 3600
+    # Machines without sample for a day, e.g. removed from the wave, are dropped
+    RETENTION = 86400
+
+    _file: PrivateJsonFile = None
+    # Machine name → [[sample ISO date, remaining bytes], …], oldest first
+    _samples: Dict[str, List[list]] = {}
+
+    def __init__(self, wave_name: str, path: str = None):
+        self._file = PrivateJsonFile(path if path is not None else os.path.join(
+            PATH_CACHE, FILE_REPLICATION_TELEMETRY.format(re.sub('[^0-9A-Za-z_-]', '_', wave_name))
+        ))
+        self._samples = self._file.read()
+
+    def record(self, machine_name: str, replication_info: dict, at: datetime.datetime):
+        remaining_bytes = self.get_remaining_bytes(replication_info)
+        if remaining_bytes is None:
+            return
+
+        window_start = at - datetime.timedelta(seconds=self.THROUGHPUT_WINDOW)
+        samples = [
+            sample for sample in self._samples.get(machine_name, [])
+            if (ReplicationPollScheduler.parse_datetime(sample[0]) or datetime.datetime.min) >= window_start
+        ]
+        samples.append([at.isoformat(), remaining_bytes])
+        self._samples[machine_name] = samples[-self.MAX_SAMPLES:]
+
+    def save(self):
+        # mf_watch and mf_verify_replication_status may follow the same wave at once: the samples the other one
+        # saved since are merged in, under a lock, instead of being overwritten
+        self._file.update(self._merge)
+
+    def get_throughput(self, machine_name: str):
+        samples = self._get_window(machine_name)
+        if len(samples) < 2:
+            return None
+
+        elapsed = (samples[-1][0] - samples[0][0]).total_seconds()
+        if elapsed <= 0:
+            return None
+
+        # Bytes per second, negative when the machine falls behind
+        return (samples[0][1] - samples[-1][1]) / elapsed
+
+    def get_eta(self, machine_name: str):
+        # Machines with nothing left to replicate have no completion to wait for
+        samples = self._get_window(machine_name)
+        if not samples or samples[-1][1] == 0:
+            return None
+
+        throughput = self.get_throughput(machine_name)
+        if not throughput or throughput <= 0:
+            return None
+
+        return samples[-1][0] + datetime.timedelta(seconds=samples[-1][1] / throughput)
+
+    def get_wave_throughput(self, machine_names: List[str] = None):
+        throughputs = [self.get_throughput(machine_name) for machine_name in self._get_names(machine_names)]
+        throughputs = [throughput for throughput in throughputs if throughput is not None]
+
+        return sum(throughputs) if throughputs else None
+
+    def get_wave_eta(self, machine_names: List[str] = None):
+        # The wave is done when its last machine is: any pending machine without ETA leaves the wave without one
+        pending_machine_names = [
+            machine_name for machine_name in self._get_names(machine_names)
+            if self._get_window(machine_name) and self._get_window(machine_name)[-1][1] > 0
+        ]
+        etas = [self.get_eta(machine_name) for machine_name in pending_machine_names]
+        if not etas or None in etas:
+            return None
+
+        return max(etas)
+
+    @classmethod
+    def get_remaining_bytes(cls, replication_info: dict):
+        if 'totalStorageBytes' not in replication_info and 'backloggedStorageBytes' not in replication_info:
+            return None
+
+        initial_sync_bytes = max(
+            replication_info.get('totalStorageBytes', 0) - replication_info.get('replicatedStorageBytes', 0), 0
+        ) if 'lastConsistencyDateTime' not in replication_info else 0
+
+        return initial_sync_bytes + replication_info.get('backloggedStorageBytes', 0)
+
+    def _merge(self, stored_samples: dict) -> dict:
+        for machine_name, samples in stored_samples.items():
+            samples_by_date = {sample[0]: sample for sample in samples}
+            samples_by_date.update({sample[0]: sample for sample in self._samples.get(machine_name, [])})
+            # ISO dates of the same format sort chronologically
+            self._samples[machine_name] = sorted(samples_by_date.values())[-self.MAX_SAMPLES:]
+
+        last_sample_dates = {
+            machine_name: window[-1][0]
+            for machine_name, window in ((name, self._get_window(name)) for name in self._samples) if window
+        }
+        if last_sample_dates:
+            retention_start = max(last_sample_dates.values()) - datetime.timedelta(seconds=self.RETENTION)
+            self._samples = {
+                machine_name: self._samples[machine_name]
+                for machine_name, last_sample_date in last_sample_dates.items() if last_sample_date >= retention_start
+            }
+
+        return self._samples
+
+    def _get_names(self, machine_names: List[str] = None) -> List[str]:
+        return list(self._samples.keys()) if machine_names is None else machine_names
+
+    def _get_window(self, machine_name: str) -> List[tuple]:
+        samples = [
+            (ReplicationPollScheduler.parse_datetime(at), remaining_bytes)
+            for at, remaining_bytes in self._samples.get(machine_name, [])
+        ]
+        samples = [sample for sample in samples if sample[0] is not None]
+        if not samples:
+            return []
+
+        window_start = samples[-1][0] - datetime.timedelta(seconds=self.THROUGHPUT_WINDOW)
+
+        return [sample for sample in samples if sample[0] >= window_start]
+
+
+if __name__ == '__main__':
+    print("This file is a library file. It cannot be called directly.")
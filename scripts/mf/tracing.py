@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+import atexit
+import json
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from . import ENV_VAR_TRACE_FILE, ENV_VAR_TRACE_SUMMARY
+
+
+class RequestTracer:
+    """
+        Records every API request sent through the HttpSessionPool sessions: endpoint, status, latency, sizes
+        and cache hits, one record per attempt. The waits before retries are recorded apart.
+        Records are appended to a JSONL trace file and summed up per endpoint when the command ends.
+        Enabled by environment variables only, so that it costs nothing when unused.
+    """
+
+    TRUTHY_VALUES = ['1', 'true', 'yes', 'y', 'on']
+
+    # Path segments replaced by a placeholder, so that calls on different resources share the same endpoint
+    IDENTIFIER_PATTERN = re.compile(
+        r'^([0-9]+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,})$'
+    )
+
+    _trace_file: str = None
+    _is_summary_enabled: bool = False
+    _is_set_up: bool = False
+    _latencies: Dict[Tuple[str, str], List[float]] = {}
+    _retry_waits: Dict[Tuple[str, str], List[float]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def setup(cls, trace_file: str = None, summary: bool = None):
+        with cls._lock:
+            cls._trace_file = trace_file if trace_file is not None else cls._get_environment(ENV_VAR_TRACE_FILE)
+            if summary is None:
+                summary = (cls._get_environment(ENV_VAR_TRACE_SUMMARY) or '').lower() in cls.TRUTHY_VALUES
+            cls._is_summary_enabled = summary
+
+            if cls._is_summary_enabled and not cls._is_set_up:
+                atexit.register(cls.print_summary)
+            cls._is_set_up = True
+
+    @classmethod
+    def is_enabled(cls):
+        if not cls._is_set_up:
+            cls.setup()
+
+        return cls._trace_file is not None or cls._is_summary_enabled
+
+    @classmethod
+    def record(cls, verb: str, url: str, status_code: int = None, latency: float = 0, bytes_out: int = None,
+               bytes_in: int = None, from_cache: bool = False):
+        if not cls.is_enabled():
+            return
+
+        endpoint = cls.get_endpoint_template(url)
+        trace = {
+            'time': round(time.time(), 3),
+            'event': 'request',
+            'verb': verb.upper(),
+            'host': urlsplit(url).netloc,
+            'endpoint': endpoint,
+            'status': status_code,
+            'latency_ms': round(latency * 1000, 1),
+            'bytes_out': bytes_out,
+            'bytes_in': bytes_in,
+            'from_cache': from_cache,
+        }
+
+        with cls._lock:
+            cls._latencies.setdefault((verb.upper(), endpoint), []).append(latency)
+            cls._write(trace)
+
+    @classmethod
+    def record_retry(cls, verb: str, url: str, wait: float):
+        if not cls.is_enabled():
+            return
+
+        endpoint = cls.get_endpoint_template(url)
+        trace = {
+            'time': round(time.time(), 3),
+            'event': 'retry',
+            'verb': verb.upper(),
+            'host': urlsplit(url).netloc,
+            'endpoint': endpoint,
+            'wait_ms': round(wait * 1000, 1),
+        }
+
+        with cls._lock:
+            cls._retry_waits.setdefault((verb.upper(), endpoint), []).append(wait)
+            cls._write(trace)
+
+    @classmethod
+    def _write(cls, trace: dict):
+        if cls._trace_file is None:
+            return
+
+        # Called with the lock held
+        try:
+            with open(cls._trace_file, 'a') as trace_file:
+                trace_file.write(json.dumps(trace) + '\n')
+        except OSError as error:
+            logging.getLogger('root').warning('{}: cannot write trace to “{}”, tracing stops: {}'.format(
+                cls.__name__, cls._trace_file, error
+            ))
+            cls._trace_file = None
+
+    @classmethod
+    def get_endpoint_template(cls, url: str) -> str:
+        return '/'.join(
+            '{id}' if cls.IDENTIFIER_PATTERN.match(segment) else segment
+            for segment in urlsplit(url).path.split('/')
+        )
+
+    @classmethod
+    def get_summary(cls) -> List[dict]:
+        with cls._lock:
+            latencies_by_endpoint = {key: sorted(latencies) for key, latencies in cls._latencies.items()}
+            retry_waits = {key: list(waits) for key, waits in cls._retry_waits.items()}
+
+        # Latencies are per attempt: the waits before retries are summed apart
+        return [
+            {
+                'verb': verb,
+                'endpoint': endpoint,
+                'calls': len(latencies),
+                'total_ms': round(sum(latencies) * 1000, 1),
+                'p50_ms': round(cls._percentile(latencies, 50) * 1000, 1),
+                'p95_ms': round(cls._percentile(latencies, 95) * 1000, 1),
+                'retries': len(retry_waits.get((verb, endpoint), [])),
+                'retry_wait_ms': round(sum(retry_waits.get((verb, endpoint), [])) * 1000, 1),
+            }
+            for (verb, endpoint), latencies in sorted(
+                latencies_by_endpoint.items(), key=lambda item: sum(item[1]), reverse=True
+            )
+        ]
+
+    @classmethod
+    def print_summary(cls, output=sys.stderr):
+        summary = cls.get_summary()
+        if not summary:
+            return
+
+        width = max(len('{} {}'.format(line['verb'], line['endpoint'])) for line in summary)
+        print('', file=output)
+        print('{:<{width}} {:>7} {:>11} {:>9} {:>9} {:>8} {:>11}'.format(
+            'Endpoint', 'Calls', 'Total (ms)', 'p50 (ms)', 'p95 (ms)', 'Retries', 'Wait (ms)', width=width
+        ), file=output)
+        for line in summary:
+            print('{:<{width}} {:>7} {:>11} {:>9} {:>9} {:>8} {:>11}'.format(
+                '{} {}'.format(line['verb'], line['endpoint']),
+                line['calls'],
+                line['total_ms'],
+                line['p50_ms'],
+                line['p95_ms'],
+                line['retries'],
+                line['retry_wait_ms'],
+                width=width
+            ), file=output)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._latencies = {}
+            cls._retry_waits = {}
+
+    @classmethod
+    def _percentile(cls, sorted_values: List[float], percentile: int) -> float:
+        # Nearest-rank method
+        rank = max(math.ceil(percentile / 100 * len(sorted_values)), 1)
+
+        return sorted_values[rank - 1]
+
+    @classmethod
+    def _get_environment(cls, env_var_names: List[str]):
+        for env_var_name in env_var_names:
+            if env_var_name in os.environ:
+                return os.getenv(env_var_name)
+
+        return None
+
+
+if __name__ == '__main__':
+    print("This file is a library file. It cannot be called directly.")
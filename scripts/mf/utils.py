@@ -1,15 +1,27 @@
 #!/usr/bin/env python3
+import codecs
+import copy
 import csv
+import fcntl
 import getpass
 import json
 import logging
 import os
+import random
 import re
 import subprocess
 import sys
-from typing import List
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from .tracing import RequestTracer
 
 
 class MessageBag:
@@ -88,41 +100,584 @@ class Utils:
         ))
 
 
+class PrivateJsonFile:
+    """ JSON document stored in a file readable by the current user only """
+
+    _path: str = None
+
+    def __init__(self, path: str):
+        self._path = path
+
+    def get_path(self):
+        return self._path
+
+    def read(self) -> dict:
+        try:
+            with open(self._path, 'r') as json_file:
+                content = json.load(json_file)
+        except (OSError, ValueError):
+            return {}
+
+        return content if isinstance(content, dict) else {}
+
+    def write(self, content: dict):
+        temporary_path = '{}.{}'.format(self._path, os.getpid())
+
+        try:
+            os.makedirs(os.path.dirname(self._path), mode=0o700, exist_ok=True)
+            with os.fdopen(os.open(temporary_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600), 'w') as json_file:
+                json.dump(content, json_file)
+            os.chmod(temporary_path, 0o600)
+            # Atomic: concurrent scripts never read a partially written file
+            os.replace(temporary_path, self._path)
+        except OSError as error:
+            logging.getLogger('root').warning('{}: cannot write “{}”: {}'.format(
+                self.__class__.__name__, self._path, error
+            ))
+
+    def update(self, merge: Callable[[dict], dict]):
+        """ Writes what merge returns from the stored content, exclusively among the processes sharing the file """
+        try:
+            os.makedirs(os.path.dirname(self._path), mode=0o700, exist_ok=True)
+            lock_file = os.open(self._path + '.lock', os.O_CREAT | os.O_WRONLY, 0o600)
+        except OSError as error:
+            logging.getLogger('root').warning('{}: cannot lock “{}”: {}'.format(
+                self.__class__.__name__, self._path, error
+            ))
+            self.write(merge(self.read()))
+            return
+
+        # Closing the lock file, or the end of the process, releases the lock
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self.write(merge(self.read()))
+        finally:
+            os.close(lock_file)
+
+
+class RequestError(Exception):
+    """ Raised by Requester for unexpected response codes, when not exiting on errors """
+
+    # Length of the response quoted in the message
+    MESSAGE_CONTENT_LENGTH = 500
+
+    verb: str = None
+    url: str = None
+    status_code: int = None
+    content: bytes = None
+
+    def __init__(self, verb: str, url: str, status_code: int, content: bytes = None):
+        super().__init__('{} “{}” failed (code: “{}”){}'.format(
+            verb.upper(),
+            url,
+            status_code,
+            ': ' + content[:self.MESSAGE_CONTENT_LENGTH].decode('utf-8', 'replace') if content else ''
+        ))
+        self.verb = verb
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+
+
+class SingleFlight:
+    """
+        Lets concurrent identical calls share one execution: the first caller runs it,
+        the others wait for its outcome and get their own copy of the result.
+    """
+
+    class _Flight:
+        def __init__(self):
+            self.done = threading.Event()
+            self.followers = 0
+            self.result = None
+            self.error: BaseException = None
+
+    _flights: Dict[Any, _Flight] = {}
+    _lock = None
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args, **kwargs):
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = self._Flight()
+            else:
+                flight.followers += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                followers = flight.followers
+            if flight.error is None and followers:
+                # Followers copy a snapshot the leader's caller cannot mutate
+                flight.result = copy.deepcopy(result)
+            flight.done.set()
+
+        return result
+
+
+class RateLimiter:
+    """ Spaces out calls, shared among threads, so that no more than “rate” calls start per second """
+
+    _interval: float = 0
+    _next_call: float = 0
+    _lock = None
+
+    def __init__(self, rate: float = None):
+        self._interval = 1 / rate if rate else 0
+        self._next_call = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self._interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_call - now
+            self._next_call = max(now, self._next_call) + self._interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class JsonStreamDecoder:
+    """
+        Decodes a JSON array incrementally from chunks of bytes, yielding its items one at a time.
+        Items can be projected on a few fields, so that large lists are never held whole in memory.
+        Requester only streams bodies from the socket when no response cache is installed (--no-cache):
+        requests-cache reads whole bodies to store them, then only the decoding and projection are incremental.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    WHITESPACES = ' \t\n\r'
+    DELIMITERS = WHITESPACES + ',]'
+
+    _decoder = json.JSONDecoder()
+
+    @classmethod
+    def iter_items(cls, chunks: Iterable[bytes], fields: List[str] = None) -> Iterator[Any]:
+        for item in cls._iter_raw_items(chunks):
+            yield cls.project(item, fields)
+
+    @classmethod
+    def project(cls, item, fields: List[str] = None):
+        if fields is None or not isinstance(item, dict):
+            return item
+
+        return {field: item[field] for field in fields if field in item}
+
+    @classmethod
+    def _iter_raw_items(cls, chunks: Iterable[bytes]) -> Iterator[Any]:
+        text_decoder = codecs.getincrementaldecoder('utf-8')()
+        chunks = iter(chunks)
+        buffer = ''
+        position = 0
+        is_array_open = False
+        is_exhausted = False
+
+        while True:
+            position = cls._skip(buffer, position, cls.WHITESPACES + (',' if is_array_open else ''))
+
+            if position < len(buffer):
+                if not is_array_open:
+                    if buffer[position] != '[':
+                        raise ValueError('{}: a JSON array was expected, got “{}”.'.format(
+                            cls.__name__, buffer[position:position + 20]
+                        ))
+                    is_array_open = True
+                    position += 1
+                    continue
+
+                if buffer[position] == ']':
+                    return
+
+                try:
+                    item, end = cls._decoder.raw_decode(buffer, position)
+                    # A number cut by the end of the chunk would be decoded partially: wait for its delimiter
+                    if is_exhausted or (end < len(buffer) and buffer[end] in cls.DELIMITERS):
+                        position = end
+                        yield item
+                        continue
+                except json.JSONDecodeError:
+                    if is_exhausted:
+                        raise
+
+            if is_exhausted:
+                if is_array_open:
+                    raise ValueError('{}: truncated JSON array.'.format(cls.__name__))
+                return
+
+            chunk = next(chunks, None)
+            if chunk is None:
+                is_exhausted = True
+                buffer = buffer[position:] + text_decoder.decode(b'', final=True)
+            else:
+                buffer = buffer[position:] + (text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+            position = 0
+
+    @classmethod
+    def _skip(cls, buffer: str, position: int, characters: str) -> int:
+        while position < len(buffer) and buffer[position] in characters:
+            position += 1
+
+        return position
+
+
+class RetryPolicy:
+    """
+        Decides whether a failed request is retried, and how long to wait before:
+        exponential backoff with full jitter, or the delay asked by the server with a “Retry-After” header.
+    """
+
+    DEFAULT_MAX_RETRIES = 4
+    DEFAULT_BACKOFF_FACTOR = 1.0
+    DEFAULT_MAX_BACKOFF = 30.0
+    MAX_RETRY_AFTER = 300.0
+
+    IDEMPOTENT_VERBS = ['get', 'head', 'options', 'put', 'delete']
+    # Throttled requests were not processed: they can be retried whatever the verb
+    THROTTLING_STATUS_CODES = [429]
+    TRANSIENT_STATUS_CODES = [502, 503, 504]
+
+    _max_retries: int = DEFAULT_MAX_RETRIES
+    _backoff_factor: float = DEFAULT_BACKOFF_FACTOR
+    _max_backoff: float = DEFAULT_MAX_BACKOFF
+    _retried_verbs: List[str] = IDEMPOTENT_VERBS
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES, backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                 max_backoff: float = DEFAULT_MAX_BACKOFF, retried_verbs: List[str] = None):
+        self._max_retries = max(max_retries, 0)
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        self._retried_verbs = [verb.lower() for verb in (retried_verbs or self.IDEMPOTENT_VERBS)]
+
+    def __str__(self):
+        return '{}(max_retries={}, backoff_factor={}, max_backoff={}, verbs={})'.format(
+            self.__class__.__name__, self._max_retries, self._backoff_factor, self._max_backoff, self._retried_verbs
+        )
+
+    def get_max_retries(self):
+        return self._max_retries
+
+    def should_retry_status(self, verb: str, status_code: int, attempt: int) -> bool:
+        if attempt >= self._max_retries:
+            return False
+
+        if status_code in self.THROTTLING_STATUS_CODES:
+            return True
+
+        return status_code in self.TRANSIENT_STATUS_CODES and verb.lower() in self._retried_verbs
+
+    def should_retry_error(self, verb: str, attempt: int, is_connect_error: bool = False) -> bool:
+        if attempt >= self._max_retries:
+            return False
+
+        # Connections that could not be established sent nothing: they can be retried whatever the verb
+        return is_connect_error or verb.lower() in self._retried_verbs
+
+    def get_wait(self, attempt: int, retry_after: str = None) -> float:
+        wait_asked = self.parse_retry_after(retry_after)
+        if wait_asked is not None:
+            return min(wait_asked, self.MAX_RETRY_AFTER)
+
+        return random.uniform(0, min(self._max_backoff, self._backoff_factor * (2 ** attempt)))
+
+    @classmethod
+    def parse_retry_after(cls, retry_after: str = None):
+        if not retry_after:
+            return None
+
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            pass
+
+        try:
+            return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            return None
+
+
+class RetryStatistics:
+    """ Counts, per endpoint, the retries made by Requester and the time spent waiting for them """
+
+    _retries: Dict[str, int] = {}
+    _wait: Dict[str, float] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def record(cls, endpoint: str, wait: float):
+        with cls._lock:
+            cls._retries[endpoint] = cls._retries.get(endpoint, 0) + 1
+            cls._wait[endpoint] = cls._wait.get(endpoint, 0) + wait
+
+    @classmethod
+    def get(cls) -> Dict[str, dict]:
+        with cls._lock:
+            return {
+                endpoint: {'retries': retries, 'wait': round(cls._wait[endpoint], 3)}
+                for endpoint, retries in cls._retries.items()
+            }
+
+    @classmethod
+    def get_total(cls) -> Tuple[int, float]:
+        with cls._lock:
+            return sum(cls._retries.values()), sum(cls._wait.values())
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._retries = {}
+            cls._wait = {}
+
+
+class TracingHTTPAdapter(HTTPAdapter):
+    """ HTTP adapter handing every request it sends to RequestTracer: each attempt is timed on its own """
+
+    def send(self, request, stream=False, **kwargs):
+        if not RequestTracer.is_enabled():
+            return super().send(request, stream=stream, **kwargs)
+
+        started_at = time.monotonic()
+        try:
+            response = super().send(request, stream=stream, **kwargs)
+            # The body is read here instead of by the session, so that the latency includes the download
+            bytes_in = self.get_response_size(response) if stream else len(response.content)
+        except requests.RequestException:
+            RequestTracer.record(request.method, request.url, None, time.monotonic() - started_at,
+                                 bytes_out=self.get_request_size(request))
+            raise
+
+        RequestTracer.record(request.method, request.url, response.status_code, time.monotonic() - started_at,
+                             bytes_out=self.get_request_size(request), bytes_in=bytes_in)
+
+        return response
+
+    @classmethod
+    def trace_cache_hit(cls, response, *args, **kwargs):
+        # Cached responses never reach the adapter: they are traced by this session response hook
+        if getattr(response, 'from_cache', False):
+            RequestTracer.record(response.request.method, response.url, response.status_code, 0,
+                                 bytes_out=cls.get_request_size(response.request),
+                                 bytes_in=cls.get_response_size(response), from_cache=True)
+
+        return response
+
+    @classmethod
+    def get_request_size(cls, request) -> int:
+        return len(request.body) if isinstance(request.body, (str, bytes)) else 0
+
+    @classmethod
+    def get_response_size(cls, response):
+        content_length = response.headers.get('Content-Length')
+
+        return int(content_length) if content_length and content_length.isdigit() else None
+
+
+class HttpSessionPool:
+    """
+        Shares one keep-alive requests.Session per endpoint (scheme and host),
+        so that successive calls reuse the same TCP and TLS connections.
+        Mirrors the requests module API: HttpSessionPool.get(url, …) can replace requests.get(url, …).
+    """
+
+    DEFAULT_POOL_SIZE = 16
+
+    _sessions: Dict[str, requests.Session] = {}
+    _lock = threading.Lock()
+    _pool_size: int = DEFAULT_POOL_SIZE
+
+    @classmethod
+    def configure(cls, pool_size: int = None):
+        with cls._lock:
+            if pool_size is not None:
+                cls._pool_size = max(pool_size, 1)
+
+            # Sessions are rebuilt with the new settings on next use
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions = {}
+
+    @classmethod
+    def ensure_pool_size(cls, pool_size: int):
+        if pool_size > cls._pool_size:
+            cls.configure(pool_size=pool_size)
+
+    @classmethod
+    def get_session(cls, url: str) -> requests.Session:
+        endpoint = cls.get_endpoint(url)
+
+        with cls._lock:
+            if endpoint not in cls._sessions:
+                logging.getLogger('root').debug('{}: opening a session for “{}” (pool size: {})'.format(
+                    cls.__name__, endpoint, cls._pool_size
+                ))
+                cls._sessions[endpoint] = cls.create_session()
+
+            return cls._sessions[endpoint]
+
+    @classmethod
+    def create_session(cls) -> requests.Session:
+        # No retry at transport level: Requester retries, so that a request is never retried by two layers
+        adapter = TracingHTTPAdapter(pool_connections=cls._pool_size, pool_maxsize=cls._pool_size, max_retries=0)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.hooks['response'].append(TracingHTTPAdapter.trace_cache_hit)
+
+        return session
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions = {}
+
+    @classmethod
+    def request(cls, method: str, url: str, **kwargs):
+        return cls.get_session(url).request(method=method.upper(), url=url, **kwargs)
+
+    @classmethod
+    def get(cls, url: str, **kwargs):
+        return cls.request('get', url, **kwargs)
+
+    @classmethod
+    def post(cls, url: str, **kwargs):
+        return cls.request('post', url, **kwargs)
+
+    @classmethod
+    def put(cls, url: str, **kwargs):
+        return cls.request('put', url, **kwargs)
+
+    @classmethod
+    def patch(cls, url: str, **kwargs):
+        return cls.request('patch', url, **kwargs)
+
+    @classmethod
+    def delete(cls, url: str, **kwargs):
+        return cls.request('delete', url, **kwargs)
+
+    @classmethod
+    def get_endpoint(cls, url: str) -> str:
+        parts = urlsplit(url)
+
+        return '{}://{}'.format(parts.scheme, parts.netloc)
+
+
 class Requester:
     """ Decorator around requests for enhanced logging """
 
     RESPONSE_TYPE_TEXT = 'text'
     RESPONSE_TYPE_RAW = 'raw'
     RESPONSE_TYPE_JSON = 'json'
+    RESPONSE_TYPE_STREAM = 'stream'
+
+    _retry_policies: Dict[Tuple[str, str], RetryPolicy] = {(None, None): RetryPolicy()}
+    _single_flight: SingleFlight = SingleFlight()
 
     @classmethod
-    def get(cls, uri, url=None, headers=None, data=None, request_instance=requests, exit_on_error=True,
+    def set_retry_policy(cls, retry_policy: RetryPolicy, verb: str = None, url_prefix: str = None):
+        cls._retry_policies[(verb.lower() if verb else None, url_prefix)] = retry_policy
+
+    @classmethod
+    def get_retry_policy(cls, verb: str, url: str) -> RetryPolicy:
+        url_prefixes = sorted(
+            [prefix for (_, prefix) in cls._retry_policies if prefix is not None and url.startswith(prefix)],
+            key=len,
+            reverse=True
+        )
+
+        # The most specific policy wins: verb and endpoint, endpoint, verb, then default
+        for url_prefix in url_prefixes + [None]:
+            for policy_verb in [verb.lower(), None]:
+                if (policy_verb, url_prefix) in cls._retry_policies:
+                    return cls._retry_policies[(policy_verb, url_prefix)]
+
+        return cls._retry_policies[(None, None)]
+
+    @classmethod
+    def get(cls, uri, url=None, headers=None, data=None, request_instance=None, exit_on_error=True,
             response_type=RESPONSE_TYPE_JSON):
-        return Requester._do_request(request_instance, 'get', url, uri, headers, data, [200], exit_on_error,
-                                     response_type)
+        # Concurrent identical GETs (same URL, headers and session) wait for the one in flight
+        key = (
+            url,
+            uri,
+            tuple(sorted((headers or {}).items())),
+            str(data),
+            id(request_instance),
+            exit_on_error,
+            response_type
+        )
+
+        return cls._single_flight.do(
+            key,
+            Requester._do_request,
+            request_instance, 'get', url, uri, headers, data, [200], exit_on_error, response_type
+        )
+
+    @classmethod
+    def get_stream(cls, uri, url=None, headers=None, request_instance=None, exit_on_error=True, fields=None):
+        if request_instance is None:
+            request_instance = HttpSessionPool.get_session(
+                ('' if url is None else url.rstrip('/') + '/') + uri.lstrip('/')
+            )
+
+        if not hasattr(request_instance, 'cache'):
+            chunks = Requester._do_request(request_instance, 'get', url, uri, headers, None, [200], exit_on_error,
+                                           cls.RESPONSE_TYPE_STREAM)
+
+            return JsonStreamDecoder.iter_items(chunks, fields)
+
+        # Cached sessions hold the whole body anyway: concurrent identical loads share its download (see get()),
+        # then each caller decodes the shared bytes incrementally
+        content = cls.get(uri, url, headers, None, request_instance, exit_on_error, cls.RESPONSE_TYPE_RAW)
+
+        return JsonStreamDecoder.iter_items(
+            (content[start:start + JsonStreamDecoder.CHUNK_SIZE]
+             for start in range(0, len(content), JsonStreamDecoder.CHUNK_SIZE)),
+            fields
+        )
 
     @classmethod
-    def post(cls, uri, url=None, headers=None, data=None, request_instance=requests, exit_on_error=True,
+    def post(cls, uri, url=None, headers=None, data=None, request_instance=None, exit_on_error=True,
              response_type=RESPONSE_TYPE_JSON):
         return Requester._do_request(request_instance, 'post', url, uri, headers, data, [200, 201], exit_on_error,
                                      response_type)
 
     @classmethod
-    def put(cls, uri, url=None, headers=None, data=None, request_instance=requests, exit_on_error=True,
+    def put(cls, uri, url=None, headers=None, data=None, request_instance=None, exit_on_error=True,
             response_type=RESPONSE_TYPE_JSON):
         return Requester._do_request(request_instance, 'put', url, uri, headers, data, [200, 201], exit_on_error,
                                      response_type)
 
     @classmethod
-    def patch(cls, uri, url=None, headers=None, data=None, request_instance=requests, exit_on_error=True,
+    def patch(cls, uri, url=None, headers=None, data=None, request_instance=None, exit_on_error=True,
               response_type=RESPONSE_TYPE_JSON):
         return Requester._do_request(request_instance, 'patch', url, uri, headers, data, [200], exit_on_error,
                                      response_type)
 
     @classmethod
-    def delete(cls, uri, url=None, headers=None, data=None, request_instance=requests, exit_on_error=True,
+    def delete(cls, uri, url=None, headers=None, data=None, request_instance=None, exit_on_error=True,
                response_type=RESPONSE_TYPE_JSON):
-        return Requester._do_request(request_instance, 'delete', url, uri, headers, data, [200, 204], exit_on_error,
+        return Requester._do_request(request_instance, 'delete', url, uri, headers, data, [200, 202, 204], exit_on_error,
                                      response_type)
 
     @classmethod
@@ -138,35 +693,76 @@ class Requester:
 
         uri = uri.lstrip('/')
 
-        logging.getLogger('root').debug("{}: Using “{}” as requests instance for {} “{}”".format(
-            cls.__class__.__name__, type(request_instance), url, uri
-        ))
+        if request_instance is None:
+            request_instance = HttpSessionPool.get_session(url + uri)
 
-        response = getattr(request_instance, verb.lower())(
-            url=url + uri,
-            headers=headers,
-            data=data
-        )
+        logger = logging.getLogger('root')
+        # Messages are only built when the level is enabled: responses can be large
+        is_debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
-        logging.getLogger('root').info('{}: {} “{}” “{}” (code: “{}”)'.format(
-            cls.__class__.__name__, verb.upper(), url, uri, str(response.status_code)
-        ))
-        logging.getLogger('root').debug(
-            "{}: {} “{}” “{}” (code: “{}”). Cached: {}\nSent data:\n{}\nSent headers:\n{}\nResponse:\n{}\n".format(
-                cls.__class__.__name__,
-                verb.upper(),
-                url,
-                uri,
-                str(response.status_code),
-                str(response.from_cache),
-                str(data),
-                str(headers),
-                str(response.content)
+        if is_debug_enabled:
+            logger.debug("{}: Using “{}” as requests instance for {} “{}”".format(
+                cls.__class__.__name__, type(request_instance), url, uri
+            ))
+
+        is_stream = response_type == cls.RESPONSE_TYPE_STREAM
+        # Cached sessions read the whole body to store it: the decoding stays incremental, not the download
+        is_stream_downloaded = is_stream and not hasattr(request_instance, 'cache')
+        retry_policy = cls.get_retry_policy(verb, url + uri)
+        attempt = 0
+        while True:
+            try:
+                response = getattr(request_instance, verb.lower())(
+                    url=url + uri,
+                    headers=headers,
+                    data=data,
+                    stream=is_stream_downloaded
+                )
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if not retry_policy.should_retry_error(verb, attempt, cls._is_connect_error(error)):
+                    raise
+                cls._wait_before_retry(verb, url + uri, str(error), retry_policy.get_wait(attempt), attempt)
+                attempt += 1
+                continue
+
+            if response.status_code in expected_codes or \
+                    not retry_policy.should_retry_status(verb, response.status_code, attempt):
+                break
+
+            # The connection of a streamed response goes back to the pool only once the response is closed
+            response.close()
+            cls._wait_before_retry(
+                verb,
+                url + uri,
+                'code: “{}”'.format(response.status_code),
+                retry_policy.get_wait(attempt, response.headers.get('Retry-After')),
+                attempt
+            )
+            attempt += 1
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('{}: {} “{}” “{}” (code: “{}”)'.format(
+                cls.__class__.__name__, verb.upper(), url, uri, str(response.status_code)
+            ))
+        if is_debug_enabled:
+            logger.debug(
+                "{}: {} “{}” “{}” (code: “{}”). Cached: {}\nSent data:\n{}\nSent headers:\n{}\nResponse:\n{}\n".format(
+                    cls.__class__.__name__,
+                    verb.upper(),
+                    url,
+                    uri,
+                    str(response.status_code),
+                    str(getattr(response, 'from_cache', False)),
+                    str(data),
+                    str(headers),
+                    '(streamed)' if is_stream else str(response.content)
+                )
             )
-        )
 
         if response.status_code not in expected_codes:
-            logging.getLogger('root').error(
+            # Callers not exiting on errors handle them (e.g. a rejected session is renewed): details are debug only
+            logging.getLogger('root').log(
+                logging.ERROR if exit_on_error else logging.DEBUG,
                 "{}: {} “{}” “{}” (code: “{}”). Sent data:\n{}\nResponse:\n{}\n".format(
                     cls.__class__.__name__,
                     verb.upper(),
@@ -180,14 +776,37 @@ class Requester:
             if exit_on_error:
                 sys.exit(50)
 
+            raise RequestError(verb, url + uri, response.status_code, response.content)
+
         if response_type == cls.RESPONSE_TYPE_RAW:
             return response.content
 
         if response_type == cls.RESPONSE_TYPE_TEXT:
             return response.text
 
+        if is_stream:
+            return response.iter_content(chunk_size=JsonStreamDecoder.CHUNK_SIZE)
+
         return json.loads(response.content or 'null')
 
+    @classmethod
+    def _is_connect_error(cls, error: requests.RequestException) -> bool:
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+
+        return isinstance(reason, NewConnectionError)
+
+    @classmethod
+    def _wait_before_retry(cls, verb: str, url: str, reason: str, wait: float, attempt: int):
+        logging.getLogger('root').warning('{}: {} “{}” failed ({}), retry #{} in {:.1f}s.'.format(
+            cls.__name__, verb.upper(), url, reason, attempt + 1, wait
+        ))
+        RetryStatistics.record(HttpSessionPool.get_endpoint(url), wait)
+        RequestTracer.record_retry(verb, url, wait)
+        time.sleep(wait)
+
 
 class EnvironmentVariableFetcher:
     """ Fetch environment variables """